@@ -0,0 +1,51 @@
+#!/usr/bin/python
+import sys
+import json
+import time
+import argparse
+from receiptsParsing.batch_runner import BatchRunner
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Run many parse_csv.py style jobs from a JSON manifest.")
+    parser.add_argument('manifest', help='JSON list of {"config", "inputs", "output", "source", ...} jobs')
+    parser.add_argument('--workers', dest='workers', type=int)
+    parser.add_argument('--verbose', action='store_true', help="Print parsing warnings for each job")
+    args = parser.parse_args()
+
+    try:
+        with open(args.manifest, 'rt') as manifest_file:
+            jobs = json.load(manifest_file)
+    except Exception as e:
+        print(f"Error reading manifest: {e}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    results = BatchRunner(args.workers).run(jobs)
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    for result in results:
+        total = sum(result['timings'].values())
+        stages = ", ".join(f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in result['timings'].items())
+        if result['status'] == 'ok':
+            counts = result['counts']
+            print(f"OK    {result['name']}: {total:.2f}s ({stages}); "
+                  f"{counts['categorized']} categorized, {counts['multiple_matches']} multiple, "
+                  f"{counts['unmatched']} unmatched, {len(result['warnings'])} warnings")
+        else:
+            failed += 1
+            print(f"ERROR {result['name']}: {result['error']} ({stages})")
+
+        if args.verbose:
+            for warning in result['warnings']:
+                print(f"      {warning}")
+
+    print(f"{len(results)} jobs, {failed} failed in {elapsed:.2f}s")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
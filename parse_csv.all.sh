@@ -1,10 +1,11 @@
 #!/bin/bash
 set -e -x
 
-dateStr=`date +%s`
-bkpdir=./bkp/${dateStr}
-mkdir -p bkp
-mv out ${bkpdir}
+# Deduplicated snapshot of the previous outputs (see ./snapshot.py list/diff/restore)
+if [ -d out ]; then
+  python ./snapshot.py --store bkp create out
+  rm -rf out
+fi
 mkdir -p out
 
 ##cmd="./parse_csv.py --month $1 --outFileName ./out/$(date +"%Y%m%d").out.csv ./in/*.csv"
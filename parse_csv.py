@@ -1,10 +1,15 @@
 #!/usr/bin/python
+import os
 import sys
 import argparse
 import calendar
 from datetime import datetime
 from receiptsParsing.processor import TransactionProcessor
 from receiptsParsing.csv_handler import CsvHandler
+from receiptsParsing.columnar_handler import ColumnarHandler
+from receiptsParsing.sqlite_store import SqliteStore
+from receiptsParsing.anomaly_detector import AnomalyDetector
+from receiptsParsing.parse_cache import ParseCache
 
 
 def main():
@@ -16,6 +21,12 @@ def main():
     parser.add_argument('inFiles', metavar='inFile', nargs='+')
     parser.add_argument('--outFileName', dest='outFileName', default="tmp.out.txt")
     parser.add_argument('--source', dest='source')
+    parser.add_argument('--sqliteDb', dest='sqliteDb', help="Also upsert transactions into this SQLite database")
+    parser.add_argument('--anomalyState', dest='anomalyState', help="Flag unusual amounts, keeping statistics in this file")
+    parser.add_argument('--readWorkers', dest='readWorkers', type=int, default=1,
+                        help="Threads used to read and decompress input files")
+    parser.add_argument('--cacheDir', dest='cacheDir', help="Cache parsed transactions per input file here")
+    parser.add_argument('--outFormat', dest='outFormat', choices=['csv', 'parquet', 'npz'], default='csv')
     args = parser.parse_args()
 
     # Load purposes configuration from external file
@@ -28,16 +39,17 @@ def main():
     # Initialize processor
     processor = TransactionProcessor(purposesMap)
     
-    # Read CSV files
+    # Read and parse CSV files, reusing cached parses of unchanged files if requested
     try:
-        csv_rows = CsvHandler.read_csv_files(args.inFiles)
+        if args.cacheDir:
+            parse_result = ParseCache(args.cacheDir).parse_files(args.inFiles, processor, args.readWorkers)
+        else:
+            csv_rows = CsvHandler.read_csv_files(args.inFiles, args.readWorkers)
+            parse_result = processor.parse_csv_rows(csv_rows)
     except Exception as e:
         print(f"Error reading CSV files: {e}")
         sys.exit(1)
     
-    # Parse transactions
-    parse_result = processor.parse_csv_rows(csv_rows)
-    
     # Print any parsing errors
     for error in parse_result['errors']:
         print(error)
@@ -51,6 +63,20 @@ def main():
     
     # Process transactions
     process_result = processor.process_transactions(parse_result['transactions'], date_filter)
+    for error in process_result['errors']:
+        print(error)
+    
+    # Flag unusual amounts against the statistics of earlier runs; state is saved after the output
+    anomalies = []
+    if args.anomalyState:
+        detector = AnomalyDetector()
+        if os.path.exists(args.anomalyState):
+            try:
+                detector.load(args.anomalyState)
+            except Exception as e:
+                print(f"Error reading anomaly state: {e}")
+                sys.exit(1)
+        anomalies = detector.process(process_result)
     
     # Combine all transactions for CSV output:
     # - Categorized transactions (as-is)
@@ -63,15 +89,40 @@ def main():
     
     # Write output file
     try:
-        CsvHandler.write_transactions(
-            args.outFileName, 
-            all_for_csv, 
-            args.source
-        )
+        if args.outFormat == 'csv':
+            CsvHandler.write_transactions(
+                args.outFileName, 
+                all_for_csv, 
+                args.source
+            )
+        else:
+            ColumnarHandler.write_transactions(
+                args.outFileName,
+                all_for_csv,
+                args.source,
+                args.outFormat
+            )
     except Exception as e:
         print(f"Error writing output file: {e}")
         sys.exit(1)
     
+    # Upsert into the SQLite store if requested
+    if args.sqliteDb:
+        try:
+            with SqliteStore(args.sqliteDb) as store:
+                store.upsert_transactions(all_for_csv, args.source)
+        except Exception as e:
+            print(f"Error writing SQLite database: {e}")
+            sys.exit(1)
+    
+    # Only keep the updated statistics once the output exists, so a failed run can be retried
+    if args.anomalyState:
+        try:
+            detector.save(args.anomalyState)
+        except Exception as e:
+            print(f"Error writing anomaly state: {e}")
+            sys.exit(1)
+    
     # Print multiple matches warnings
     for item in process_result['multiple_matches']:
         transaction = item['transaction']
@@ -83,9 +134,12 @@ def main():
     for item in sorted_unmatched:
         transaction = item['transaction']
         print(f"No match: {transaction.description} ({transaction.amount})")
+    
+    # Print unusual amounts
+    for anomaly in anomalies:
+        transaction = anomaly['item']['transaction']
+        print(f"Unusual for {anomaly['kind']} {anomaly['key']}: {transaction.description} ({transaction.amount}) - {anomaly['reason']}")
 
 
 if __name__ == "__main__":
     main()
-
-
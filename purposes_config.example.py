@@ -28,6 +28,12 @@ purposesMap = {
             'Rates': [
                 "COUNCIL",
             ],
+            'Insurance': [
+                # Rules can also match on amount, source, date and raw ubank fields.
+                # Each matching rule counts as a match, so keep rules from overlapping
+                # patterns that already cover the same transactions.
+                {'description': 'INSURER NAME', 'fields': {'Payment type': 'BPAY'}, 'amount': (400, 900), 'source': 'Bills Account'},
+            ],
             'Utilities': [
                 "ELECTRICITY COMPANY",
                 "GAS COMPANY",
@@ -0,0 +1,49 @@
+#!/usr/bin/python
+import sys
+import csv
+import argparse
+from decimal import Decimal
+from receiptsParsing.sqlite_store import SqliteStore
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Query transactions stored with parse_csv.py --sqliteDb.")
+    parser.add_argument('dbFileName', metavar='dbFile')
+    parser.add_argument('--category', dest='category', help="Category path, e.g. Transport/Fuel")
+    parser.add_argument('--start', dest='start', help="Earliest effective date (YYYY-MM-DD)")
+    parser.add_argument('--end', dest='end', help="Latest effective date (YYYY-MM-DD)")
+    parser.add_argument('--source', dest='source', help="Source label given to parse_csv.py --source")
+    parser.add_argument('--account', dest='account', help="Bank account the transactions came from")
+    parser.add_argument('--minAmount', dest='minAmount', type=Decimal)
+    parser.add_argument('--maxAmount', dest='maxAmount', type=Decimal)
+    args = parser.parse_args()
+
+    with SqliteStore(args.dbFileName) as store:
+        results = store.query(
+            category=args.category,
+            start=args.start,
+            end=args.end,
+            source=args.account,
+            source_label=args.source,
+            min_amount=args.minAmount,
+            max_amount=args.maxAmount
+        )
+
+    writer = csv.writer(sys.stdout, delimiter=',')
+    for result in results:
+        writer.writerow([
+            result['effective_date'],
+            result['posted_date'],
+            result['amount'],
+            result['category'],
+            result['description'],
+            result['source']
+        ])
+
+    total = sum((result['amount'] for result in results), Decimal(0))
+    print(f"{len(results)} transactions, total {total}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
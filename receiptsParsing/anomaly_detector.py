@@ -0,0 +1,330 @@
+"""
+Spend anomaly detection - streaming per-category and per-merchant statistics.
+
+Every statistic is updated in O(1) per transaction and the whole state is
+JSON-serialisable, so incremental runs continue from where the last one stopped.
+"""
+import os
+import json
+import math
+import hashlib
+from datetime import date, datetime
+from collections import Counter
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P-square algorithm (Jain & Chlamtac)."""
+
+    def __init__(self, p=0.5):
+        """Initialize for the p-quantile (0 < p < 1)."""
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        """Add an observation."""
+        heights = self.heights
+
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+
+        for i in range(cell + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            delta = self.desired[i] - self.positions[i]
+            if ((delta >= 1 and self.positions[i + 1] - self.positions[i] > 1)
+                    or (delta <= -1 and self.positions[i - 1] - self.positions[i] < -1)):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                self.positions[i] += step
+
+    @property
+    def value(self):
+        """Current estimate, or None before any observation."""
+        if not self.heights:
+            return None
+        if len(self.heights) < 5:
+            return self.heights[int(round((len(self.heights) - 1) * self.p))]
+        return self.heights[2]
+
+    def _parabolic(self, i, step):
+        h, n = self.heights, self.positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, step):
+        h, n = self.heights, self.positions
+        return h[i] + step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+
+    def to_dict(self):
+        return {'p': self.p, 'heights': self.heights, 'positions': self.positions, 'desired': self.desired}
+
+    @staticmethod
+    def from_dict(data):
+        quantile = P2Quantile(data['p'])
+        quantile.heights = data['heights']
+        quantile.positions = data['positions']
+        quantile.desired = data['desired']
+        return quantile
+
+
+class RollingStats:
+    """Count, mean, variance (Welford), median and frequency of a stream of amounts."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.median = P2Quantile(0.5)
+        self.first_day = None
+        self.last_day = None
+
+    def add(self, value, day):
+        """
+        Add an observation.
+
+        Args:
+            value: Amount as a float
+            day: Effective date as a proleptic Gregorian ordinal
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.median.add(value)
+        # Runs may arrive out of date order, e.g. when backfilling older statements
+        self.first_day = day if self.first_day is None else min(self.first_day, day)
+        self.last_day = day if self.last_day is None else max(self.last_day, day)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def per_month(self):
+        """Average number of transactions per 30 days over the observed period."""
+        if self.count < 2 or self.last_day == self.first_day:
+            return float(self.count)
+        return self.count * 30 / (self.last_day - self.first_day)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'median': self.median.to_dict(),
+            'first_day': self.first_day,
+            'last_day': self.last_day
+        }
+
+    @staticmethod
+    def from_dict(data):
+        stats = RollingStats()
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats.m2 = data['m2']
+        stats.median = P2Quantile.from_dict(data['median'])
+        stats.first_day = data['first_day']
+        stats.last_day = data['last_day']
+        return stats
+
+
+class AnomalyDetector:
+    """Flags transactions whose amount is unusual for their category or merchant."""
+
+    def __init__(self, z_threshold=3.0, ratio_threshold=3.0, min_count=5, retention_days=400):
+        """
+        Initialize detection thresholds.
+
+        Args:
+            z_threshold: Flag amounts more than this many standard deviations above the mean
+            ratio_threshold: Flag amounts more than this many times the median
+            min_count: Observations needed for a key before it can flag anything
+            retention_days: Days behind the newest counted transaction for which row keys
+                            are kept; older transactions are ignored rather than recounted
+        """
+        self.z_threshold = z_threshold
+        self.ratio_threshold = ratio_threshold
+        self.min_count = min_count
+        self.retention_days = retention_days
+        self.stats = {'category': {}, 'merchant': {}}
+        # Effective date (ISO) -> row keys already counted on that day
+        self.seen = {}
+
+    def process(self, process_result):
+        """
+        Update statistics with processed transactions and flag outliers.
+
+        Only debits are counted; credits such as refunds are marked as seen but
+        are neither flagged nor added to the statistics.
+
+        Transactions already counted by an earlier run are skipped, so overlapping
+        runs do not count a transaction twice, whatever order the runs cover. Row
+        keys are only kept for retention_days behind the newest counted day, so the
+        state stays bounded; later runs skip transactions older than that. Each
+        transaction is compared with the statistics from before it was added.
+
+        Args:
+            process_result: Result dict from TransactionProcessor.process_transactions
+
+        Returns:
+            list: dicts with 'item', 'kind' ('category' | 'merchant'), 'key',
+                  'amount', 'mean', 'median', 'z_score' and 'reason'
+        """
+        items = []
+        items.extend(process_result['categorized'])
+        items.extend(process_result['multiple_matches'])
+        items.extend(process_result['unmatched'])
+        items.sort(key=lambda item: item['transaction'].effectiveDate)
+
+        # Keys older than this may already have been pruned, so such rows cannot be told apart from counted ones
+        horizon = self._horizon(self._newest_seen())
+
+        flags = []
+        occurrences = Counter()
+        for item in items:
+            transaction = item['transaction']
+            row = self._row_fields(transaction)
+            row_key = self._row_key(row, occurrences[row])
+            occurrences[row] += 1
+            effective_date = transaction.effectiveDate.strftime("%Y-%m-%d")
+            if horizon is not None and effective_date < horizon:
+                continue
+            seen_that_day = self.seen.setdefault(effective_date, set())
+            if row_key in seen_that_day:
+                continue
+            seen_that_day.add(row_key)
+
+            # Refunds and other credits are not spend; counting them would drag the usual amount down
+            amount = float(transaction.amount)
+            if amount <= 0:
+                continue
+            day = transaction.effectiveDate.toordinal()
+            for kind, key in self._keys(item):
+                stats = self.stats[kind].get(key)
+                if stats is None:
+                    stats = self.stats[kind][key] = RollingStats()
+                flag = self._check(stats, amount)
+                if flag:
+                    flag.update({'item': item, 'kind': kind, 'key': key})
+                    flags.append(flag)
+                stats.add(amount, day)
+
+        prune_before = self._horizon(self._newest_seen())
+        if prune_before is not None:
+            for effective_date in [day for day in self.seen if day < prune_before]:
+                del self.seen[effective_date]
+
+        return flags
+
+    def _newest_seen(self):
+        """Return the ordinal of the newest day with counted rows, or None if none."""
+        if not self.seen:
+            return None
+        return date.fromisoformat(max(self.seen)).toordinal()
+
+    def _horizon(self, newest):
+        """Return the ISO date before which row keys are not kept, or None without history."""
+        if newest is None:
+            return None
+        return date.fromordinal(newest - self.retention_days).isoformat()
+
+    def _check(self, stats, amount):
+        """Compare an amount with existing statistics; return a partial flag dict or None."""
+        if stats.count < self.min_count:
+            return None
+
+        stddev = stats.stddev
+        z_score = (amount - stats.mean) / stddev if stddev else 0.0
+        median = stats.median.value
+
+        reasons = []
+        if z_score > self.z_threshold:
+            reasons.append(f"{z_score:.1f} standard deviations above mean")
+        if median and amount > self.ratio_threshold * median:
+            reasons.append(f"{amount / median:.1f}x median")
+        if not reasons:
+            return None
+
+        return {
+            'amount': amount,
+            'mean': stats.mean,
+            'median': median,
+            'z_score': z_score,
+            'reason': "; ".join(reasons)
+        }
+
+    @staticmethod
+    def _keys(item):
+        """Return the (kind, key) pairs a transaction's statistics are kept under."""
+        categorization = item['categorization']
+        category_path = ["TODO"] if categorization['status'] == 'no_match' else categorization['selected_category']
+        transaction = item['transaction']
+        merchant = getattr(transaction, 'rawDescription', transaction.description)
+        return [('category', "/".join(category_path)), ('merchant', merchant.strip().upper())]
+
+    @staticmethod
+    def _row_fields(transaction):
+        """Return the fields that identify a transaction across runs."""
+        return (transaction.source, transaction.effectiveDate.isoformat(), str(transaction.amount), transaction.description)
+
+    @staticmethod
+    def _row_key(row, occurrence):
+        """
+        Hash a transaction's identifying fields for the seen set.
+
+        The occurrence number keeps legitimately identical rows in one run apart,
+        e.g. two equal coffees on the same day.
+        """
+        key = "\x1f".join(row + (str(occurrence),))
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def save(self, file_path):
+        """Persist statistics and the seen row keys as JSON, replacing the file atomically."""
+        state = {
+            'stats': {
+                kind: {key: stats.to_dict() for key, stats in by_key.items()}
+                for kind, by_key in self.stats.items()
+            },
+            'seen': {day: sorted(keys) for day, keys in sorted(self.seen.items())},
+            'saved_at': datetime.now().isoformat(timespec='seconds')
+        }
+        temp_path = file_path + '.tmp'
+        with open(temp_path, 'wt') as outfile:
+            json.dump(state, outfile)
+        os.replace(temp_path, file_path)
+
+    def load(self, file_path):
+        """Restore statistics and the seen row keys saved by save()."""
+        with open(file_path, 'rt') as infile:
+            state = json.load(infile)
+        self.stats = {
+            kind: {key: RollingStats.from_dict(data) for key, data in by_key.items()}
+            for kind, by_key in state['stats'].items()
+        }
+        self.seen = {day: set(keys) for day, keys in state.get('seen', {}).items()}
@@ -0,0 +1,158 @@
+"""
+Batch runner - processes many (config, inputs, output) jobs in one interpreter.
+
+Jobs run on a thread pool. Processors are shared between jobs whose purposes
+configurations are identical, and compiled patterns are shared between all
+configurations through the categorizer's pattern cache.
+"""
+import os
+import time
+import calendar
+import threading
+import importlib.util
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from .processor import TransactionProcessor
+from .csv_handler import CsvHandler
+
+
+def load_purposes_map(config_path):
+    """
+    Load purposesMap from a purposes_config style Python file.
+
+    Args:
+        config_path: Path to the configuration file
+
+    Returns:
+        dict: The file's purposesMap
+    """
+    module_name = "purposes_config_" + str(abs(hash(os.path.abspath(config_path))))
+    spec = importlib.util.spec_from_file_location(module_name, config_path)
+    if spec is None:
+        raise ImportError(f"Cannot load configuration: {config_path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.purposesMap
+
+
+class BatchRunner:
+    """Runs batch jobs, reusing loaded configurations and processors between them."""
+
+    def __init__(self, max_workers=None):
+        """Initialize with the size of the worker pool (defaults to the executor's default)."""
+        self.max_workers = max_workers
+        self._configs = {}
+        self._processors = {}
+        self._lock = threading.Lock()
+
+    def processor_for(self, config_path):
+        """
+        Return the shared processor for a configuration file, creating it on first use.
+
+        Args:
+            config_path: Path to the configuration file
+
+        Returns:
+            TransactionProcessor: Processor shared by all jobs with an identical purposesMap
+        """
+        with self._lock:
+            path = os.path.abspath(config_path)
+            purposes_map = self._configs.get(path)
+            if purposes_map is None:
+                purposes_map = self._configs[path] = load_purposes_map(path)
+
+            fingerprint = repr(purposes_map)
+            processor = self._processors.get(fingerprint)
+            if processor is None:
+                processor = self._processors[fingerprint] = TransactionProcessor(purposes_map)
+            return processor
+
+    def run_job(self, job):
+        """
+        Run a single job.
+
+        Args:
+            job: dict with 'config', 'inputs' (list of paths) and 'output', and optionally
+                 'name', 'source', 'readAll' (default True), 'year' and 'month'
+
+        Returns:
+            dict: {
+                'name': job name (defaults to the output path),
+                'status': 'ok' | 'error',
+                'error': error message or None,
+                'warnings': list of parsing errors and warnings,
+                'counts': dict of categorized/multiple_matches/unmatched/filtered_out counts,
+                'timings': dict of stage name -> seconds
+            }
+        """
+        result = {
+            'name': job.get('name', job.get('output')),
+            'status': 'ok',
+            'error': None,
+            'warnings': [],
+            'counts': {},
+            'timings': {}
+        }
+        stage = 'setup'
+        stage_start = time.perf_counter()
+
+        def finish_stage(next_stage):
+            nonlocal stage, stage_start
+            now = time.perf_counter()
+            result['timings'][stage] = now - stage_start
+            stage, stage_start = next_stage, now
+
+        try:
+            processor = self.processor_for(job['config'])
+            finish_stage('read')
+
+            csv_rows = CsvHandler.read_csv_files(job['inputs'])
+            finish_stage('parse')
+
+            parse_result = processor.parse_csv_rows(csv_rows)
+            result['warnings'].extend(parse_result['errors'])
+            finish_stage('process')
+
+            date_filter = None
+            if not job.get('readAll', True):
+                year, month = job['year'], job['month']
+                date_filter = {
+                    'start': datetime(year, month, 1),
+                    'end': datetime(year, month, calendar.monthrange(year, month)[1])
+                }
+            process_result = processor.process_transactions(parse_result['transactions'], date_filter)
+            result['warnings'].extend(process_result['errors'])
+            finish_stage('write')
+
+            all_for_csv = []
+            all_for_csv.extend(process_result['categorized'])
+            all_for_csv.extend(process_result['multiple_matches'])
+            all_for_csv.extend(process_result['unmatched'])
+            CsvHandler.write_transactions(job['output'], all_for_csv, job.get('source'))
+            finish_stage(None)
+
+            result['counts'] = {
+                'categorized': len(process_result['categorized']),
+                'multiple_matches': len(process_result['multiple_matches']),
+                'unmatched': len(process_result['unmatched']),
+                'filtered_out': process_result['filtered_out']
+            }
+        except Exception as e:
+            result['status'] = 'error'
+            result['error'] = f"{stage}: {e}"
+            finish_stage(None)
+
+        return result
+
+    def run(self, jobs):
+        """
+        Run all jobs on the worker pool.
+
+        Args:
+            jobs: List of job dicts (see run_job)
+
+        Returns:
+            list: Job results in the same order as jobs
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.run_job, jobs))
@@ -1,6 +1,8 @@
 """
 Transaction categorization logic - pure functions with no I/O or side effects.
 """
+from .rules import CategoryRule, RuleIndex
+
 
 class TransactionCategorizer:
     """Handles categorization of transactions based on purpose mapping."""
@@ -8,6 +10,20 @@ class TransactionCategorizer:
     def __init__(self, purposes_map):
         """Initialize with a purposes mapping configuration."""
         self.purposes_map = purposes_map
+        self.rules = self._compile_rules(purposes_map)
+        
+        # Plain description regexes are simply scanned; anything else goes through the index
+        if all(rule.is_pattern_only for rule in self.rules):
+            self._patterns = [(rule.path, rule.description) for rule in self.rules]
+            self._index = None
+        else:
+            self._patterns = None
+            self._index = RuleIndex(self.rules)
+    
+    @property
+    def matches_description_only(self):
+        """Whether categorization depends on nothing but the transaction description."""
+        return self._index is None
     
     def categorize_transaction(self, transaction):
         """
@@ -23,7 +39,11 @@ class TransactionCategorizer:
                 'selected_category': chosen category path or None
             }
         """
-        purpose_lists = transaction.getPurposes(self.purposes_map)
+        if self._index is None:
+            description = transaction.description
+            purpose_lists = [list(path) for path, regex in self._patterns if regex.search(description)]
+        else:
+            purpose_lists = self._index.match(transaction)
         
         if len(purpose_lists) == 0:
             return {
@@ -43,4 +63,32 @@ class TransactionCategorizer:
                 'categories': purpose_lists,
                 'selected_category': purpose_lists[0]  # Default to first match
             }
-    
+
+    @staticmethod
+    def _compile_rules(purposes_map, path=None):
+        """
+        Flatten a purposes mapping into compiled rules.
+
+        Rules keep the order in which the mapping is walked, so matches come out
+        in configuration order.
+
+        Args:
+            purposes_map: Nested dict of category name -> sub-mapping or rule list
+            path: Category path of purposes_map within the full mapping
+
+        Returns:
+            list: CategoryRule objects in mapping order
+        """
+        path = path or []
+        rules = []
+
+        for purpose, value in purposes_map.items():
+            purpose_path = path + [purpose]
+
+            if hasattr(value, 'items'):
+                rules.extend(TransactionCategorizer._compile_rules(value, purpose_path))
+            else:
+                for pattern in value:
+                    rules.append(CategoryRule(purpose_path, pattern))
+
+        return rules
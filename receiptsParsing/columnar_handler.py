@@ -0,0 +1,169 @@
+"""
+Columnar binary output - typed, dictionary-encoded alternative to the CSV writer.
+
+Uses Parquet when pyarrow is installed, otherwise falls back to a NumPy .npz
+archive. Neither library is required unless this writer is actually used.
+"""
+from datetime import datetime
+from .csv_handler import CsvHandler
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+EPOCH = datetime(1970, 1, 1)
+CATEGORY_COLUMNS = ('category_level0', 'category_level1', 'category_level2')
+
+
+class ColumnarHandler:
+    """Handles writing transactions to columnar binary files."""
+
+    @staticmethod
+    def available_format():
+        """
+        Return the best columnar format that can be written in this environment.
+
+        Returns:
+            str: 'parquet', 'npz', or None if neither pyarrow nor numpy is installed
+        """
+        if pyarrow is not None:
+            return 'parquet'
+        if numpy is not None:
+            return 'npz'
+        return None
+
+    @staticmethod
+    def write_transactions(file_path, transaction_items, source_label, output_format=None):
+        """
+        Write transaction items to a columnar binary file.
+
+        Args:
+            file_path: Output file path
+            transaction_items: List of transaction result dicts from processor
+            source_label: Label to add to source column
+            output_format: 'parquet' or 'npz'; defaults to the best available format
+
+        Returns:
+            str: The format that was written
+        """
+        output_format = output_format or ColumnarHandler.available_format()
+        if output_format is None:
+            raise RuntimeError("Columnar output requires pyarrow or numpy to be installed")
+
+        if output_format == 'parquet':
+            if pyarrow is None:
+                raise RuntimeError("Parquet output requires pyarrow to be installed; use 'npz' with numpy instead")
+            ColumnarHandler._write_parquet(file_path, ColumnarHandler.build_columns(transaction_items, source_label))
+        elif output_format == 'npz':
+            if numpy is None:
+                raise RuntimeError("npz output requires numpy to be installed")
+            ColumnarHandler._write_npz(file_path, ColumnarHandler.build_columns(transaction_items, source_label))
+        else:
+            raise ValueError(f"Unknown columnar format: {output_format}")
+
+        return output_format
+
+    @staticmethod
+    def build_columns(transaction_items, source_label):
+        """
+        Convert transaction items into plain Python columns.
+
+        Dates become days since 1970-01-01, amounts become integer cents and
+        category levels become integer codes into a per-level dictionary.
+
+        Args:
+            transaction_items: List of transaction result dicts from processor
+            source_label: Label to add to source column
+
+        Returns:
+            dict: column name -> list of values, plus '<category column>_dictionary'
+                  entries holding the distinct category names
+        """
+        columns = {
+            'effective_date': [],
+            'posted_date': [],
+            'amount_cents': [],
+            'description': [],
+            'notes': [],
+            'source': [],
+        }
+        dictionaries = {name: {} for name in CATEGORY_COLUMNS}
+        for name in CATEGORY_COLUMNS:
+            columns[name] = []
+
+        for item in transaction_items:
+            transaction = item['transaction']
+            categorization = item['categorization']
+
+            levels = CsvHandler.format_category_levels(
+                ["TODO"] if categorization['status'] == 'no_match' else categorization['selected_category']
+            )
+
+            columns['effective_date'].append(ColumnarHandler._to_days(transaction.effectiveDate))
+            columns['posted_date'].append(ColumnarHandler._to_days(transaction.postedDate))
+            columns['amount_cents'].append(CsvHandler.to_cents(transaction.amount))
+            columns['description'].append(transaction.description)
+            columns['notes'].append("")
+            source_info = f"{transaction.source} ({source_label})" if transaction.source else source_label
+            # A missing label is written as an empty string, as csv.writer does
+            columns['source'].append("" if source_info is None else source_info)
+
+            for name, level in zip(CATEGORY_COLUMNS, levels):
+                codes = dictionaries[name]
+                columns[name].append(codes.setdefault(level, len(codes)))
+
+        for name in CATEGORY_COLUMNS:
+            columns[name + '_dictionary'] = list(dictionaries[name])
+
+        return columns
+
+    @staticmethod
+    def _to_days(date_value):
+        """Convert a datetime to whole days since the Unix epoch."""
+        return (date_value - EPOCH).days
+
+    @staticmethod
+    def _write_parquet(file_path, columns):
+        """Write columns as a Parquet file with date32 and dictionary types."""
+        arrays = {
+            'effective_date': pyarrow.array(columns['effective_date'], type=pyarrow.int32()).cast(pyarrow.date32()),
+            'posted_date': pyarrow.array(columns['posted_date'], type=pyarrow.int32()).cast(pyarrow.date32()),
+            'amount_cents': pyarrow.array(columns['amount_cents'], type=pyarrow.int64()),
+        }
+        for name in CATEGORY_COLUMNS:
+            arrays[name] = pyarrow.DictionaryArray.from_arrays(
+                pyarrow.array(columns[name], type=pyarrow.int32()),
+                pyarrow.array(columns[name + '_dictionary'], type=pyarrow.string())
+            )
+        arrays['description'] = pyarrow.array(columns['description'], type=pyarrow.string())
+        arrays['notes'] = pyarrow.array(columns['notes'], type=pyarrow.string())
+        arrays['source'] = pyarrow.array(columns['source'], type=pyarrow.string())
+
+        table = pyarrow.table(arrays)
+        pyarrow.parquet.write_table(table, file_path)
+
+    @staticmethod
+    def _write_npz(file_path, columns):
+        """Write columns as a compressed NumPy archive with datetime64[D] dates."""
+        arrays = {
+            'effective_date': numpy.array(columns['effective_date'], dtype='datetime64[D]'),
+            'posted_date': numpy.array(columns['posted_date'], dtype='datetime64[D]'),
+            'amount_cents': numpy.array(columns['amount_cents'], dtype=numpy.int64),
+        }
+        for name in CATEGORY_COLUMNS:
+            arrays[name] = numpy.array(columns[name], dtype=numpy.int32)
+            arrays[name + '_dictionary'] = numpy.array(columns[name + '_dictionary'], dtype=str)
+        arrays['description'] = numpy.array(columns['description'], dtype=str)
+        arrays['notes'] = numpy.array(columns['notes'], dtype=str)
+        arrays['source'] = numpy.array(columns['source'], dtype=str)
+
+        with open(file_path, 'wb') as outfile:
+            numpy.savez_compressed(outfile, **arrays)
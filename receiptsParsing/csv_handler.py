@@ -2,31 +2,124 @@
 CSV file handling - pure I/O operations without business logic.
 """
 import csv
+import io
+import os
+import re
+import gzip
+import bz2
+import lzma
+import zipfile
+import functools
+from decimal import Decimal, ROUND_HALF_UP
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Magic numbers of the supported single-file compression formats
+COMPRESSED_OPENERS = (
+    (re.compile(rb'\x1f\x8b'), gzip.open),
+    # "BZh", block size digit, then a block or end-of-stream marker
+    (re.compile(rb'BZh[1-9](1AY&SY|\x17rE8P\x90)'), bz2.open),
+    (re.compile(rb'\xfd7zXZ\x00'), lzma.open),
+)
+
+# Zip members read as CSV, by name; compressed members are decompressed as streams
+ZIP_MEMBER_OPENERS = (
+    ('.csv', functools.partial(io.TextIOWrapper, newline='')),
+    ('.csv.gz', functools.partial(gzip.open, mode='rt', newline='')),
+    ('.csv.bz2', functools.partial(bz2.open, mode='rt', newline='')),
+    ('.csv.xz', functools.partial(lzma.open, mode='rt', newline='')),
+)
 
 
 class CsvHandler:
     """Handles reading and writing CSV files."""
     
     @staticmethod
-    def read_csv_files(file_paths):
+    def read_csv_files(file_paths, max_workers=1):
         """
         Read multiple CSV files and return all rows.
         
+        gzip, bz2, xz and zip inputs are detected from their content and
+        decompressed as streams. Only the .csv (or .csv.gz, .csv.bz2, .csv.xz)
+        members of a zip archive are read, in archive order; macOS resource
+        forks and other hidden files are skipped.
+        
         Args:
             file_paths: List of file paths to read
+            max_workers: Number of threads reading (and decompressing) files concurrently
             
         Returns:
-            list: All CSV rows combined from all files
+            list: All CSV rows combined from all files, in file order
         """
         all_rows = []
         
-        for file_path in file_paths:
-            with open(file_path, 'rt') as csvfile:
+        if max_workers > 1 and len(file_paths) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for rows in executor.map(CsvHandler._read_csv_file, file_paths):
+                    all_rows.extend(rows)
+        else:
+            for file_path in file_paths:
+                all_rows.extend(CsvHandler._read_csv_file(file_path))
+        
+        return all_rows
+    
+    @staticmethod
+    def _read_csv_file(file_path):
+        """Read all rows of one (possibly compressed or archived) CSV file."""
+        rows = []
+        
+        for csvfile in CsvHandler._open_text_streams(file_path):
+            with csvfile:
                 reader = csv.reader(csvfile, delimiter=',')
                 for row in reader:
-                    all_rows.append(row)
+                    rows.append(row)
         
-        return all_rows
+        return rows
+    
+    @staticmethod
+    def _open_text_streams(file_path):
+        """
+        Yield text streams for the CSV content of a file.
+        
+        Args:
+            file_path: Plain, gzip, bz2, xz or zip file
+            
+        Yields:
+            Text file objects; the caller closes each one
+        """
+        with open(file_path, 'rb') as probe:
+            magic = probe.read(10)
+        
+        if magic.startswith(b'PK\x03\x04'):
+            with zipfile.ZipFile(file_path) as archive:
+                for member in archive.infolist():
+                    opener = CsvHandler._zip_member_opener(member)
+                    if opener is None:
+                        continue
+                    yield opener(archive.open(member))
+            return
+        
+        for signature, opener in COMPRESSED_OPENERS:
+            if signature.match(magic):
+                yield opener(file_path, 'rt', newline='')
+                return
+        
+        # newline='' as the csv module requires, so line breaks inside quoted fields survive
+        yield open(file_path, 'rt', newline='')
+    
+    @staticmethod
+    def _zip_member_opener(member):
+        """Return how to open a zip member as text, or None if it is not CSV content."""
+        if member.is_dir() or member.filename.startswith('__MACOSX/'):
+            return None
+        name = os.path.basename(member.filename).lower()
+        if name.startswith('.'):
+            return None
+        for suffix, opener in ZIP_MEMBER_OPENERS:
+            if name.endswith(suffix):
+                return opener
+        return None
     
     @staticmethod
     def write_transactions(file_path, transaction_items, source_label):
@@ -42,33 +135,91 @@ class CsvHandler:
             writer = csv.writer(outfile, delimiter=',')
             
             for item in transaction_items:
-                transaction = item['transaction']
-                categorization = item['categorization']
-                
-                # Format category levels - use TODO for unmatched, otherwise format the category path
-                level0, level1, level2 = CsvHandler._format_category_levels(
-                    ["TODO"] if categorization['status'] == 'no_match' else categorization['selected_category']
-                )
-                
-                effective_date_str = transaction.effectiveDate.strftime("%Y-%m-%d")
-                posted_date_str = transaction.postedDate.strftime("%Y-%m-%d")
-                
-                source_info = f"{transaction.source} ({source_label})" if transaction.source else source_label
-                
-                writer.writerow([
-                    effective_date_str,
-                    posted_date_str,
-                    transaction.amount,
-                    level0,
-                    level1,
-                    level2,
-                    transaction.description,
-                    "",  # Notes column (empty for now)
-                    source_info
-                ])
+                writer.writerow(CsvHandler._format_row(item, source_label))
+    
+    @staticmethod
+    def merge_transactions(file_path, transaction_items, source_label):
+        """
+        Merge transaction items into an existing output CSV file.
+        
+        Rows already present in the file are not written twice. The merged rows
+        are sorted from the posted date column onwards, like `sort -t, -k2`, and
+        the file is replaced atomically.
+        
+        Args:
+            file_path: Output file path; created if it does not exist
+            transaction_items: List of transaction result dicts from processor
+            source_label: Label to add to source column
+            
+        Returns:
+            int: Number of rows added to the file
+        """
+        rows = []
+        if os.path.exists(file_path):
+            with open(file_path, 'rt', newline='') as infile:
+                rows = [tuple(row) for row in csv.reader(infile, delimiter=',')]
+        
+        # Each row already in the file absorbs one identical incoming row; identical
+        # rows within the batch (possible in formats without transaction IDs) are kept
+        existing = Counter(rows)
+        added = 0
+        for item in transaction_items:
+            # Stringify like csv.writer does (None becomes ''), so rows match what write_transactions wrote
+            row = tuple('' if value is None else str(value) for value in CsvHandler._format_row(item, source_label))
+            if existing[row]:
+                existing[row] -= 1
+            else:
+                rows.append(row)
+                added += 1
+        
+        rows.sort(key=lambda row: row[1:])
+        
+        temp_path = file_path + '.tmp'
+        with open(temp_path, 'wt', newline='') as outfile:
+            csv.writer(outfile, delimiter=',').writerows(rows)
+        os.replace(temp_path, file_path)
+        
+        return added
     
     @staticmethod
-    def _format_category_levels(category_path):
+    def _format_row(item, source_label):
+        """
+        Convert a transaction result dict into an output CSV row.
+        
+        Args:
+            item: Transaction result dict from processor
+            source_label: Label to add to source column
+            
+        Returns:
+            list: Values for the nine output columns
+        """
+        transaction = item['transaction']
+        categorization = item['categorization']
+        
+        # Format category levels - use TODO for unmatched, otherwise format the category path
+        level0, level1, level2 = CsvHandler.format_category_levels(
+            ["TODO"] if categorization['status'] == 'no_match' else categorization['selected_category']
+        )
+        
+        effective_date_str = transaction.effectiveDate.strftime("%Y-%m-%d")
+        posted_date_str = transaction.postedDate.strftime("%Y-%m-%d")
+        
+        source_info = f"{transaction.source} ({source_label})" if transaction.source else source_label
+        
+        return [
+            effective_date_str,
+            posted_date_str,
+            transaction.amount,
+            level0,
+            level1,
+            level2,
+            transaction.description,
+            "",  # Notes column (empty for now)
+            source_info
+        ]
+    
+    @staticmethod
+    def format_category_levels(category_path):
         """
         Convert category path to standardized 3-level format for CSV output.
         
@@ -82,4 +233,17 @@ class CsvHandler:
         level1 = category_path[1] if len(category_path) > 1 else ""
         level2 = category_path[2] if len(category_path) > 2 else ""
         
-        return (level0, level1, level2)
\ No newline at end of file
+        return (level0, level1, level2)
+    
+    @staticmethod
+    def to_cents(amount):
+        """
+        Convert an amount to integer cents, rounding half away from zero.
+        
+        Args:
+            amount: Decimal (or Decimal-convertible) amount
+            
+        Returns:
+            int: Amount in cents
+        """
+        return int((Decimal(amount) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
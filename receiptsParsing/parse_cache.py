@@ -0,0 +1,188 @@
+"""
+Parsed-transaction cache - skips CSV parsing for input files that have not changed.
+
+Each input file is parsed on its own and the result of parse_csv_rows, with
+dates, amounts and descriptions already materialised, is pickled under the
+SHA-256 of the file's content. An index of file size and mtime avoids
+rehashing files that have not been touched. Cache files are trusted pickles,
+so the cache directory must only be writable by the user running the tool.
+
+Entries are pruned when the files that produced them are edited or deleted,
+so the cache holds one entry per distinct input content still on disk.
+"""
+import os
+import json
+import mmap
+import pickle
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from .csv_handler import CsvHandler
+
+
+# Bump when Transaction or parse_csv_rows change what a parsed file looks like
+CACHE_VERSION = 3
+
+
+class ParseCache:
+    """Caches parse_csv_rows results per input file."""
+
+    def __init__(self, cache_dir):
+        """Initialize with the directory holding cache entries; created if needed."""
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+        try:
+            with open(self.index_path, 'rt') as infile:
+                self._index = json.load(infile)
+        except (OSError, ValueError):
+            self._index = {}
+
+    def parse_files(self, file_paths, processor, max_workers=1):
+        """
+        Parse input files, loading unchanged ones from the cache.
+
+        Journal credits left at the end of one file are applied to the first
+        transaction of the next, so the result matches parsing all the files'
+        rows in one call to parse_csv_rows.
+
+        Args:
+            file_paths: List of input file paths
+            processor: TransactionProcessor used for files that are not cached
+            max_workers: Number of threads reading (and decompressing) uncached files concurrently
+
+        Returns:
+            dict: Same shape as TransactionProcessor.parse_csv_rows, combined over all files
+        """
+        combined = {
+            'transactions': [],
+            'errors': [],
+            'journal_credits': [],
+            'first_transaction_errors': None
+        }
+
+        for parse_result in self._parse_all(file_paths, processor, max_workers):
+            errors = parse_result['errors']
+            pending = combined['journal_credits']
+            if parse_result['transactions']:
+                # Credits from earlier files are reported after those the first transaction
+                # already reported, which is where parse_csv_rows would have reported them
+                split = parse_result['first_transaction_errors']
+                carried = []
+                processor.apply_journal_credits(pending, parse_result['transactions'][0], carried)
+                errors = errors[:split] + carried + errors[split:]
+                if combined['first_transaction_errors'] is None:
+                    combined['first_transaction_errors'] = len(combined['errors']) + split + len(carried)
+            combined['transactions'].extend(parse_result['transactions'])
+            combined['errors'].extend(errors)
+            pending.extend(parse_result['journal_credits'])
+
+        self._prune()
+        return combined
+
+    def fingerprint(self, file_path):
+        """
+        Return the content hash of a file, reusing the indexed hash if size and mtime are unchanged.
+
+        Args:
+            file_path: Input file path
+
+        Returns:
+            str: Hex SHA-256 of the file content
+        """
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        entry = self._index.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as infile:
+            for chunk in iter(lambda: infile.read(1 << 20), b''):
+                digest.update(chunk)
+
+        self._index[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+        return digest.hexdigest()
+
+    def _parse_all(self, file_paths, processor, max_workers):
+        """Return each file's parse result in order, reading uncached files on a thread pool."""
+        entry_paths = [
+            os.path.join(self.cache_dir, f"{self.fingerprint(file_path)}.v{CACHE_VERSION}.pickle")
+            for file_path in file_paths
+        ]
+        results = [self._load_entry(entry_path) for entry_path in entry_paths]
+        missing = [i for i, parse_result in enumerate(results) if parse_result is None]
+        self.hits += len(results) - len(missing)
+        self.misses += len(missing)
+
+        def read(i):
+            return CsvHandler.read_csv_files([file_paths[i]])
+
+        if max_workers > 1 and len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                rows_by_file = list(executor.map(read, missing))
+        else:
+            rows_by_file = [read(i) for i in missing]
+
+        for i, csv_rows in zip(missing, rows_by_file):
+            parse_result = processor.parse_csv_rows(csv_rows)
+            for transaction in parse_result['transactions'] + parse_result['journal_credits']:
+                ParseCache._materialise(transaction)
+            self._store_entry(entry_paths[i], parse_result)
+            results[i] = parse_result
+
+        return results
+
+    @staticmethod
+    def _materialise(transaction):
+        """Compute a transaction's lazy fields so they are stored in the cache."""
+        try:
+            transaction.description
+            transaction.source
+            transaction.postedDate
+            transaction.effectiveDate
+            transaction.amount
+        except Exception:
+            # Left lazy: the error surfaces on access, exactly as without the cache
+            pass
+
+    @staticmethod
+    def _load_entry(entry_path):
+        """Unpickle a cache entry straight from a memory map; None if missing or unreadable."""
+        try:
+            with open(entry_path, 'rb') as infile:
+                with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return pickle.loads(mapped)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None
+
+    @staticmethod
+    def _store_entry(entry_path, parse_result):
+        """Write a cache entry atomically."""
+        temp_path = entry_path + '.tmp'
+        with open(temp_path, 'wb') as outfile:
+            pickle.dump(parse_result, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+
+    def _prune(self):
+        """Forget files that no longer exist, save the index and delete entries it no longer refers to."""
+        for path in [path for path in self._index if not os.path.exists(path)]:
+            del self._index[path]
+        self._save_index()
+
+        referenced = {f"{entry['sha256']}.v{CACHE_VERSION}.pickle" for entry in self._index.values()}
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pickle') and name not in referenced:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def _save_index(self):
+        """Write the size/mtime index atomically."""
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'wt') as outfile:
+            json.dump(self._index, outfile)
+        os.replace(temp_path, self.index_path)
@@ -0,0 +1,239 @@
+"""
+Trigram index over historical descriptions - what-if evaluation of candidate patterns.
+"""
+import re
+from .categorizer import TransactionCategorizer
+
+
+REPEAT_CHARS = '*?{'
+SPECIAL_CHARS = '.^$'
+
+
+def required_literals(pattern):
+    """
+    Extract literal substrings that every match of a regex must contain.
+
+    The extraction is conservative: anything it does not understand (alternation,
+    lookarounds, inline flags, ...) results in an empty list, meaning no
+    substring is required and every description has to be checked.
+
+    Args:
+        pattern: Regular expression string
+
+    Returns:
+        list: Lower-cased literal strings
+    """
+    if '|' in pattern:
+        return []
+
+    literals = []
+    current = []
+    group_starts = []
+
+    def flush():
+        if current:
+            literals.append(''.join(current).lower())
+            current.clear()
+
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+
+        if char == '\\':
+            escaped = pattern[i + 1:i + 2]
+            i += 2
+            if escaped and not escaped.isalnum():
+                current.append(escaped)
+            elif escaped and escaped in 'xuUN0123456789':
+                # Multi-character escapes (\x41, \u00e9, \N{...}, octal, back-references)
+                # would otherwise leave their trailing characters behind as literal text
+                return []
+            else:
+                # \d, \w, \b etc. are not literals
+                flush()
+        elif char in SPECIAL_CHARS:
+            flush()
+            i += 1
+        elif char == '[':
+            flush()
+            i += 1
+            if pattern[i:i + 1] == '^':
+                i += 1
+            if pattern[i:i + 1] == ']':
+                i += 1
+            while i < len(pattern) and pattern[i] != ']':
+                i += 2 if pattern[i] == '\\' else 1
+            i += 1
+        elif char == '(':
+            flush()
+            if pattern[i + 1:i + 2] == '?':
+                if pattern[i + 2:i + 3] != ':':
+                    return []
+                i += 2
+            group_starts.append(len(literals))
+            i += 1
+        elif char == ')':
+            flush()
+            start = group_starts.pop() if group_starts else 0
+            i += 1
+            if pattern[i:i + 1] in tuple(REPEAT_CHARS):
+                # The whole group is optional, so nothing inside it is required
+                del literals[start:]
+        elif char in REPEAT_CHARS:
+            # The preceding character is optional
+            if current:
+                current.pop()
+            flush()
+            if char == '{':
+                while i < len(pattern) and pattern[i] != '}':
+                    i += 1
+            i += 1
+            if pattern[i:i + 1] in ('?', '+'):
+                i += 1
+        elif char == '+':
+            flush()
+            i += 1
+            if pattern[i:i + 1] in ('?', '+'):
+                i += 1
+        else:
+            current.append(char)
+            i += 1
+
+    flush()
+    return [literal for literal in literals if literal.isascii()]
+
+
+def trigrams(text):
+    """Return the set of lower-cased character trigrams in text."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PatternIndex:
+    """
+    Deduplicated corpus of descriptions with a trigram index for fast pattern trials.
+
+    Each description keeps the distinct categorizations of the transactions
+    carrying it, since rules on amount, source, date or raw fields can put
+    transactions with the same description into different categories.
+    """
+
+    def __init__(self, purposes_map):
+        """Initialize with the current purposes mapping configuration."""
+        self.categorizer = TransactionCategorizer(purposes_map)
+        self.descriptions = []
+        self.categories = []
+        self.transaction_counts = []
+        self._ids = {}
+        self._postings = {}
+
+    def add_transactions(self, transactions):
+        """
+        Add transactions to the corpus.
+
+        With plain description patterns each description is categorized once;
+        with structured rules every transaction is categorized.
+
+        Args:
+            transactions: Iterable of Transaction objects
+
+        Returns:
+            int: Number of descriptions that were not already in the corpus
+        """
+        added = 0
+        description_only = self.categorizer.matches_description_only
+        for transaction in transactions:
+            description = transaction.description
+            description_id = self._ids.get(description)
+
+            if description_id is None:
+                description_id = len(self.descriptions)
+                self._ids[description] = description_id
+                self.descriptions.append(description)
+                self.categories.append([])
+                self.transaction_counts.append(0)
+                for trigram in trigrams(description):
+                    self._postings.setdefault(trigram, set()).add(description_id)
+                added += 1
+            elif description_only:
+                self.transaction_counts[description_id] += 1
+                continue
+
+            self.transaction_counts[description_id] += 1
+            categories = tuple(tuple(path) for path in
+                               self.categorizer.categorize_transaction(transaction)['categories'])
+            if categories not in self.categories[description_id]:
+                self.categories[description_id].append(categories)
+
+        return added
+
+    def candidates(self, pattern):
+        """
+        Return ids of descriptions that could possibly match the pattern.
+
+        Args:
+            pattern: Regular expression string
+
+        Returns:
+            list: Sorted description ids
+        """
+        required = set()
+        for literal in required_literals(pattern):
+            required |= trigrams(literal)
+
+        if not required:
+            return list(range(len(self.descriptions)))
+
+        postings = sorted((self._postings.get(trigram, set()) for trigram in required), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return sorted(result)
+
+    def evaluate(self, pattern):
+        """
+        Evaluate a candidate pattern against the corpus.
+
+        Args:
+            pattern: Regular expression string, matched case-insensitively like purposesMap
+
+        Returns:
+            dict: {
+                'matches': list of all matching descriptions,
+                'new_matches': matching descriptions with transactions that are currently uncategorized,
+                'stolen': dict mapping category path tuple -> list of descriptions with transactions in it,
+                'new_multiple_matches': descriptions with transactions that would go from one match to several,
+                'candidates_checked': number of descriptions the regex was run against
+            }
+        """
+        regex = re.compile(pattern, re.IGNORECASE)
+        candidate_ids = self.candidates(pattern)
+
+        matches = []
+        new_matches = []
+        stolen = {}
+        new_multiple_matches = []
+
+        for description_id in candidate_ids:
+            description = self.descriptions[description_id]
+            if not regex.search(description):
+                continue
+
+            matches.append(description)
+            outcomes = self.categories[description_id]
+            if any(not categories for categories in outcomes):
+                new_matches.append(description)
+            if any(len(categories) == 1 for categories in outcomes):
+                new_multiple_matches.append(description)
+            for path in dict.fromkeys(path for categories in outcomes for path in categories):
+                stolen.setdefault(path, []).append(description)
+
+        return {
+            'matches': matches,
+            'new_matches': new_matches,
+            'stolen': stolen,
+            'new_multiple_matches': new_multiple_matches,
+            'candidates_checked': len(candidate_ids)
+        }
@@ -26,12 +26,15 @@ class TransactionProcessor:
             dict: {
                 'transactions': list of Transaction objects,
                 'errors': list of error messages,
-                'journal_credits': list of journal credit transactions
+                'journal_credits': list of journal credit transactions left unapplied,
+                'first_transaction_errors': number of errors reported up to and including
+                                            the first transaction, or None without transactions
             }
         """
         transactions = []
         errors = []
         journal_credits = []
+        first_transaction_errors = None
         
         for row in csv_rows:
             if not len(row) in (5, 6, 10):
@@ -40,33 +43,59 @@ class TransactionProcessor:
             
             try:
                 trans = Transaction(row)
+                # Only the posted date is needed by every row (for the date filter);
+                # amounts and effective dates are checked by process_transactions
+                # for the rows it keeps, and here only where journal credits need them
+                trans.postedDate
+                
+                # The pattern is anchored, so the raw description is enough to decide
+                if self.journal_credit_pattern.search(trans.rawDescription):
+                    if trans.amount != 0:
+                        errors.append(f"Warning: ignoring non-zero journal credit: {trans}")
+                    else:
+                        journal_credits.append(trans)
+                    continue
+                
+                self.apply_journal_credits(journal_credits, trans, errors)
             except Exception as e:
-                errors.append(f"Failed to parse row: {', '.join(row)} - {str(e)}")
+                errors.append(self._parse_error(row, e))
                 continue
             
-            if self.journal_credit_pattern.search(trans.description):
-                if trans.amount != 0:
-                    errors.append(f"Warning: ignoring non-zero journal credit: {trans}")
-                else:
-                    journal_credits.append(trans)
-            else:
-                # Apply any pending journal credits to this transaction
-                if journal_credits:
-                    if trans.amount < 0:
-                        while journal_credits:
-                            trans.description = journal_credits.pop().description + "; " + trans.description
-                    else:
-                        while journal_credits:
-                            errors.append(f"Warning: ignoring non-prefix journal credit: {journal_credits.pop()}")
-                
-                transactions.append(trans)
+            if not transactions:
+                first_transaction_errors = len(errors)
+            transactions.append(trans)
         
         return {
             'transactions': transactions,
             'errors': errors,
-            'journal_credits': journal_credits
+            'journal_credits': journal_credits,
+            'first_transaction_errors': first_transaction_errors
         }
     
+    @staticmethod
+    def apply_journal_credits(journal_credits, trans, errors):
+        """
+        Apply pending journal credits to the transaction that follows them.
+        
+        The credits' descriptions are prefixed to a negative transaction;
+        otherwise each credit is reported as a warning. Either way the
+        pending list is emptied.
+        
+        Args:
+            journal_credits: List of pending journal credit transactions
+            trans: The next non-journal transaction
+            errors: List that warnings are appended to
+        """
+        if not journal_credits:
+            return
+        
+        if trans.amount < 0:
+            while journal_credits:
+                trans.description = journal_credits.pop().description + "; " + trans.description
+        else:
+            while journal_credits:
+                errors.append(f"Warning: ignoring non-prefix journal credit: {journal_credits.pop()}")
+    
     def process_transactions(self, transactions, date_filter=None):
         """
         Process transactions through categorization and filtering.
@@ -80,23 +109,30 @@ class TransactionProcessor:
                 'categorized': list of dicts with transaction + categorization info,
                 'unmatched': list of transactions that couldn't be categorized,
                 'multiple_matches': list of transactions with multiple category matches,
-                'filtered_out': count of transactions filtered by date
+                'filtered_out': count of transactions filtered by date,
+                'errors': list of error messages for kept rows whose amount or
+                          effective date could not be parsed; those rows are skipped
             }
         """
+        # Apply date filter if specified, before any other work on the rejected rows
+        if date_filter:
+            kept = [t for t in transactions if self._passes_date_filter(t, date_filter)]
+            filtered_out = len(transactions) - len(kept)
+            transactions = kept
+        else:
+            filtered_out = 0
+        
+        # Parse the remaining lazy fields only for the rows that are kept
+        transactions, errors = self.validate_transactions(transactions)
+        
         # Sort transactions by effective date
         sorted_transactions = sorted(transactions, key=lambda t: t.effectiveDate)
         
         categorized = []
         unmatched = []
         multiple_matches = []
-        filtered_out = 0
         
         for transaction in sorted_transactions:
-            # Apply date filter if specified
-            if date_filter and not self._passes_date_filter(transaction, date_filter):
-                filtered_out += 1
-                continue
-            
             # Categorize the transaction
             categorization = self.categorizer.categorize_transaction(transaction)
             
@@ -118,9 +154,39 @@ class TransactionProcessor:
             'categorized': categorized,
             'unmatched': unmatched,
             'multiple_matches': multiple_matches,
-            'filtered_out': filtered_out
+            'filtered_out': filtered_out,
+            'errors': errors
         }
     
+    def validate_transactions(self, transactions):
+        """
+        Parse the effective date and amount of transactions, dropping rows where either fails.
+        
+        Args:
+            transactions: List of Transaction objects from parse_csv_rows
+            
+        Returns:
+            tuple: (list of valid transactions, list of error messages)
+        """
+        valid = []
+        errors = []
+        
+        for transaction in transactions:
+            try:
+                transaction.effectiveDate
+                transaction.amount
+            except Exception as e:
+                errors.append(self._parse_error(transaction.row, e))
+                continue
+            valid.append(transaction)
+        
+        return valid, errors
+    
+    @staticmethod
+    def _parse_error(row, error):
+        """Format the message reported for a row that could not be parsed."""
+        return f"Failed to parse row: {', '.join(row)} - {str(error)}"
+    
     def _passes_date_filter(self, transaction, date_filter):
         """Check if transaction passes date filter."""
         if 'start' in date_filter and transaction.postedDate < date_filter['start']:
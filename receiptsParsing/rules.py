@@ -0,0 +1,232 @@
+"""
+Categorization rules - compiled purposesMap entries and the indexes used to find them.
+
+A purposesMap entry is either a regex string matched against the description,
+or a dict combining any of these predicates (all must hold):
+
+    'description': regex matched against the full description
+    'merchant':    regex matched against the bank's own description only
+    'source':      source account, compared case-insensitively
+    'fields':      dict of raw field name -> value, compared case-insensitively
+                   (e.g. {'Payment type': 'BPAY'} for ubank activity rows)
+    'amount':      (min, max) inclusive, either end may be None
+    'date':        (start, end) inclusive effective dates, 'YYYY-MM-DD' or datetime
+"""
+import re
+from datetime import datetime
+from decimal import Decimal
+
+
+# Compiled patterns shared by every categorizer in the process, keyed by pattern text
+_compiled_patterns = {}
+
+RULE_KEYS = {'description', 'merchant', 'source', 'fields', 'amount', 'date'}
+NEGATIVE_INFINITY = Decimal('-Infinity')
+POSITIVE_INFINITY = Decimal('Infinity')
+
+
+def compile_pattern(pattern):
+    """Return the shared case-insensitive compiled regex for a purposes pattern."""
+    regex = _compiled_patterns.get(pattern)
+    if regex is None:
+        regex = _compiled_patterns.setdefault(pattern, re.compile(pattern, re.IGNORECASE))
+    return regex
+
+
+def field_value(transaction, name):
+    """Return the value of an equality field ('source' or a raw field name) for a transaction."""
+    if name == 'source':
+        return transaction.source
+    return transaction.rawFields.get(name, "")
+
+
+class CategoryRule:
+    """A single compiled purposesMap entry."""
+
+    def __init__(self, path, spec):
+        """
+        Compile a purposesMap entry.
+
+        Args:
+            path: Category path the rule assigns
+            spec: Regex string, or dict of predicates (see module docstring)
+        """
+        self.path = path
+
+        if isinstance(spec, str):
+            spec = {'description': spec}
+        unknown = set(spec) - RULE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown rule keys for {'/'.join(path)}: {', '.join(sorted(unknown))}")
+
+        self.description = compile_pattern(spec['description']) if 'description' in spec else None
+        self.merchant = compile_pattern(spec['merchant']) if 'merchant' in spec else None
+
+        # Equality fields, compared case-insensitively
+        self.equals = {}
+        if 'source' in spec:
+            self.equals['source'] = spec['source'].casefold()
+        for name, value in spec.get('fields', {}).items():
+            self.equals[name] = value.casefold()
+
+        self.amount = None
+        if 'amount' in spec:
+            low, high = spec['amount']
+            self.amount = (
+                NEGATIVE_INFINITY if low is None else Decimal(str(low)),
+                POSITIVE_INFINITY if high is None else Decimal(str(high))
+            )
+
+        self.date = None
+        if 'date' in spec:
+            start, end = spec['date']
+            self.date = (CategoryRule._to_date(start), CategoryRule._to_date(end))
+
+    @property
+    def is_pattern_only(self):
+        """Whether the rule is a plain description regex."""
+        return (self.merchant is None and not self.equals and self.amount is None
+                and self.date is None and self.description is not None)
+
+    def matches(self, transaction):
+        """Check every predicate of the rule against a transaction."""
+        for name, value in self.equals.items():
+            if field_value(transaction, name).casefold() != value:
+                return False
+        if self.amount is not None and not self.amount[0] <= transaction.amount <= self.amount[1]:
+            return False
+        if self.date is not None:
+            effective_date = transaction.effectiveDate.date()
+            if (self.date[0] and effective_date < self.date[0]) or (self.date[1] and effective_date > self.date[1]):
+                return False
+        if self.merchant is not None and not self.merchant.search(transaction.rawDescription):
+            return False
+        if self.description is not None and not self.description.search(transaction.description):
+            return False
+        return True
+
+    @staticmethod
+    def _to_date(value):
+        """Convert a 'YYYY-MM-DD' string or datetime to a date; None stays open-ended."""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        if isinstance(value, datetime):
+            return value.date()
+        return value
+
+
+class IntervalIndex:
+    """Static centered interval tree answering which closed intervals contain a point."""
+
+    def __init__(self, intervals):
+        """
+        Build the tree.
+
+        Args:
+            intervals: List of (low, high, value) tuples
+        """
+        self._root = IntervalIndex._build(intervals)
+
+    @staticmethod
+    def _build(intervals):
+        if not intervals:
+            return None
+
+        endpoints = sorted(point for low, high, _ in intervals for point in (low, high))
+        center = endpoints[len(endpoints) // 2]
+
+        left = [interval for interval in intervals if interval[1] < center]
+        right = [interval for interval in intervals if interval[0] > center]
+        overlapping = [interval for interval in intervals if interval[0] <= center <= interval[1]]
+
+        by_low = sorted(overlapping, key=lambda interval: interval[0])
+        by_high = sorted(overlapping, key=lambda interval: interval[1], reverse=True)
+        return (center, by_low, by_high, IntervalIndex._build(left), IntervalIndex._build(right))
+
+    def stab(self, point):
+        """
+        Return the values of all intervals containing point.
+
+        Args:
+            point: Value comparable with the interval bounds
+
+        Returns:
+            list: Values in no particular order
+        """
+        values = []
+        node = self._root
+
+        while node is not None:
+            center, by_low, by_high, left, right = node
+            if point < center:
+                for low, high, value in by_low:
+                    if low > point:
+                        break
+                    values.append(value)
+                node = left
+            elif point > center:
+                for low, high, value in by_high:
+                    if high < point:
+                        break
+                    values.append(value)
+                node = right
+            else:
+                values.extend(value for low, high, value in by_low)
+                break
+
+        return values
+
+
+class RuleIndex:
+    """
+    Decision structure over a list of rules.
+
+    Each rule is filed under one index: a hash bucket on its first equality
+    field, otherwise the interval tree on its amount range, otherwise the
+    always-checked scan list. Only the rules found through the indexes are
+    evaluated for a transaction.
+    """
+
+    def __init__(self, rules):
+        """Index rules, identified by their position in the list."""
+        self.rules = rules
+        self._buckets = {}
+        self._scan = []
+        intervals = []
+
+        for position, rule in enumerate(rules):
+            if rule.equals:
+                name, value = next(iter(rule.equals.items()))
+                self._buckets.setdefault(name, {}).setdefault(value, []).append(position)
+            elif rule.amount is not None:
+                intervals.append((rule.amount[0], rule.amount[1], position))
+            else:
+                self._scan.append(position)
+
+        self._amounts = IntervalIndex(intervals) if intervals else None
+
+    def candidates(self, transaction):
+        """
+        Return positions of rules that may match a transaction, in rule order.
+
+        Args:
+            transaction: Transaction object
+
+        Returns:
+            list: Sorted rule positions
+        """
+        positions = list(self._scan)
+        for name, bucket in self._buckets.items():
+            positions.extend(bucket.get(field_value(transaction, name).casefold(), ()))
+        if self._amounts is not None:
+            positions.extend(self._amounts.stab(transaction.amount))
+        positions.sort()
+        return positions
+
+    def match(self, transaction):
+        """Return the paths of all matching rules, in rule order."""
+        rules = self.rules
+        return [list(rules[position].path) for position in self.candidates(transaction)
+                if rules[position].matches(transaction)]
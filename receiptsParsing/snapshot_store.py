@@ -0,0 +1,228 @@
+"""
+Content-addressed snapshot store - deduplicated backups of output directories.
+
+Files are split into blocks of whole rows with content-defined boundaries, so
+inserting or changing rows only changes the blocks around them. Each block is
+stored once, compressed, under its SHA-256; a snapshot is a JSON manifest
+listing the blocks of every file.
+"""
+import os
+import json
+import time
+import zlib
+import hashlib
+from datetime import datetime
+
+
+class SnapshotStore:
+    """Creates, lists, compares and restores snapshots of a directory."""
+
+    def __init__(self, root, average_rows=64, max_rows=256):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory; created on first snapshot
+            average_rows: Average number of rows per block
+            max_rows: Upper bound on rows per block
+        """
+        self.root = root
+        self.average_rows = average_rows
+        self.max_rows = max_rows
+        self.objects_dir = os.path.join(root, 'objects')
+        self.snapshots_dir = os.path.join(root, 'snapshots')
+
+    def create(self, directory):
+        """
+        Snapshot every file below directory.
+
+        Args:
+            directory: Directory to back up
+
+        Returns:
+            dict: The snapshot manifest, including 'new_blocks' and 'stored_bytes'
+                  for the blocks this snapshot had to add
+        """
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+        files = {}
+        new_blocks = 0
+        stored_bytes = 0
+
+        for dir_path, dir_names, file_names in os.walk(directory):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                path = os.path.join(dir_path, file_name)
+                blocks = []
+                size = 0
+                with open(path, 'rb') as infile:
+                    for block in self._split_blocks(infile):
+                        digest, written = self._store_block(block)
+                        blocks.append(digest)
+                        size += len(block)
+                        if written:
+                            new_blocks += 1
+                            stored_bytes += written
+                relative_path = os.path.relpath(path, directory).replace(os.sep, '/')
+                files[relative_path] = {'size': size, 'blocks': blocks}
+
+        manifest = {
+            'id': self._new_id(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'source': os.path.abspath(directory),
+            'files': files,
+            'new_blocks': new_blocks,
+            'stored_bytes': stored_bytes
+        }
+        self._write_atomic(self._manifest_path(manifest['id']), json.dumps(manifest, indent=1).encode('utf-8'))
+        return manifest
+
+    def snapshots(self):
+        """
+        Return all snapshot manifests, oldest first.
+
+        Returns:
+            list: Manifest dicts
+        """
+        if not os.path.isdir(self.snapshots_dir):
+            return []
+        manifests = [self.load(name[:-len('.json')]) for name in os.listdir(self.snapshots_dir)
+                     if name.endswith('.json')]
+        return sorted(manifests, key=lambda manifest: (manifest['created'], manifest['id']))
+
+    def load(self, snapshot_id):
+        """Return the manifest of a snapshot."""
+        with open(self._manifest_path(snapshot_id), 'rt') as infile:
+            return json.load(infile)
+
+    def diff(self, old_id, new_id):
+        """
+        Compare two snapshots file by file.
+
+        Args:
+            old_id: Earlier snapshot id
+            new_id: Later snapshot id
+
+        Returns:
+            dict: {
+                'added': list of paths only in the new snapshot,
+                'removed': list of paths only in the old snapshot,
+                'changed': dict path -> {'added_blocks', 'removed_blocks', 'old_size', 'new_size'},
+                'unchanged': list of identical paths
+            }
+        """
+        old_files = self.load(old_id)['files']
+        new_files = self.load(new_id)['files']
+
+        result = {
+            'added': sorted(set(new_files) - set(old_files)),
+            'removed': sorted(set(old_files) - set(new_files)),
+            'changed': {},
+            'unchanged': []
+        }
+
+        for path in sorted(set(old_files) & set(new_files)):
+            old_blocks = old_files[path]['blocks']
+            new_blocks = new_files[path]['blocks']
+            if old_blocks == new_blocks:
+                result['unchanged'].append(path)
+                continue
+            result['changed'][path] = {
+                'added_blocks': len(set(new_blocks) - set(old_blocks)),
+                'removed_blocks': len(set(old_blocks) - set(new_blocks)),
+                'old_size': old_files[path]['size'],
+                'new_size': new_files[path]['size']
+            }
+
+        return result
+
+    def read_file(self, snapshot_id, path):
+        """
+        Return the content of one file in a snapshot.
+
+        Args:
+            snapshot_id: Snapshot id
+            path: Path relative to the snapshotted directory
+
+        Returns:
+            bytes: File content
+        """
+        blocks = self.load(snapshot_id)['files'][path]['blocks']
+        return b''.join(self._load_block(digest) for digest in blocks)
+
+    def restore(self, snapshot_id, destination):
+        """
+        Recreate the files of a snapshot below destination.
+
+        Args:
+            snapshot_id: Snapshot id
+            destination: Directory to write into; created if needed
+
+        Returns:
+            list: Relative paths of the restored files
+        """
+        files = self.load(snapshot_id)['files']
+
+        for path, entry in files.items():
+            target = os.path.join(destination, *path.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as outfile:
+                for digest in entry['blocks']:
+                    outfile.write(self._load_block(digest))
+
+        return sorted(files)
+
+    def _split_blocks(self, infile):
+        """Yield blocks of whole lines, ending a block where a line's CRC hits the boundary condition."""
+        lines = []
+        for line in infile:
+            lines.append(line)
+            if len(lines) >= self.max_rows or zlib.crc32(line) % self.average_rows == 0:
+                yield b''.join(lines)
+                lines = []
+        if lines:
+            yield b''.join(lines)
+
+    def _store_block(self, block):
+        """Store a block unless already present; return (digest, compressed bytes written)."""
+        digest = hashlib.sha256(block).hexdigest()
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = zlib.compress(block)
+        self._write_atomic(path, data)
+        return digest, len(data)
+
+    def _load_block(self, digest):
+        """Read and verify a stored block."""
+        with open(self._object_path(digest), 'rb') as infile:
+            block = zlib.decompress(infile.read())
+        if hashlib.sha256(block).hexdigest() != digest:
+            raise ValueError(f"Corrupt block in snapshot store: {digest}")
+        return block
+
+    def _new_id(self):
+        """Return an unused snapshot id based on the epoch time, like the old bkp/<epoch> directories."""
+        base = str(int(time.time()))
+        snapshot_id = base
+        suffix = 1
+        while os.path.exists(self._manifest_path(snapshot_id)):
+            snapshot_id = f"{base}-{suffix}"
+            suffix += 1
+        return snapshot_id
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _manifest_path(self, snapshot_id):
+        return os.path.join(self.snapshots_dir, snapshot_id + '.json')
+
+    @staticmethod
+    def _write_atomic(path, data):
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as outfile:
+            outfile.write(data)
+        os.replace(temp_path, path)
@@ -0,0 +1,181 @@
+"""
+SQLite transaction store - persistent, indexed storage of categorized transactions.
+"""
+import sqlite3
+import hashlib
+from decimal import Decimal
+from .csv_handler import CsvHandler
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    effective_date TEXT NOT NULL,
+    posted_date TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    level0 TEXT NOT NULL,
+    level1 TEXT NOT NULL,
+    level2 TEXT NOT NULL,
+    status TEXT NOT NULL,
+    description TEXT NOT NULL,
+    source TEXT NOT NULL,
+    source_label TEXT
+);
+CREATE INDEX IF NOT EXISTS transactions_effective_date ON transactions (effective_date);
+CREATE INDEX IF NOT EXISTS transactions_category ON transactions (category, effective_date);
+CREATE INDEX IF NOT EXISTS transactions_source ON transactions (source, effective_date);
+CREATE INDEX IF NOT EXISTS transactions_source_label ON transactions (source_label, effective_date);
+CREATE INDEX IF NOT EXISTS transactions_amount ON transactions (amount_cents);
+"""
+
+UPSERT = """
+INSERT INTO transactions (
+    id, effective_date, posted_date, amount_cents, category, level0, level1, level2,
+    status, description, source, source_label
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    category = excluded.category,
+    level0 = excluded.level0,
+    level1 = excluded.level1,
+    level2 = excluded.level2,
+    status = excluded.status,
+    source_label = excluded.source_label
+"""
+
+COLUMNS = ('effective_date', 'posted_date', 'amount_cents', 'category',
+           'status', 'description', 'source', 'source_label')
+
+
+class SqliteStore:
+    """Handles storing and querying transactions in a local SQLite database."""
+
+    def __init__(self, db_path):
+        """Open (creating if needed) the database at db_path."""
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def upsert_transactions(self, transaction_items, source_label):
+        """
+        Insert transaction items, updating the categorization of ones already stored.
+
+        All rows are written with a single executemany inside one transaction.
+
+        Args:
+            transaction_items: List of transaction result dicts from processor
+            source_label: Label stored alongside each transaction's source
+
+        Returns:
+            int: Number of rows written
+        """
+        rows = []
+        occurrences = {}
+
+        for item in transaction_items:
+            transaction = item['transaction']
+            categorization = item['categorization']
+
+            category_path = ["TODO"] if categorization['status'] == 'no_match' else categorization['selected_category']
+            level0, level1, level2 = CsvHandler.format_category_levels(category_path)
+
+            effective_date_str = transaction.effectiveDate.strftime("%Y-%m-%d")
+            posted_date_str = transaction.postedDate.strftime("%Y-%m-%d")
+            amount_cents = CsvHandler.to_cents(transaction.amount)
+
+            # Identical rows (possible in the older formats) are told apart by occurrence
+            natural_key = (effective_date_str, posted_date_str, amount_cents,
+                           transaction.description, transaction.source)
+            occurrence = occurrences.get(natural_key, 0)
+            occurrences[natural_key] = occurrence + 1
+
+            rows.append((
+                SqliteStore._row_id(natural_key, occurrence),
+                effective_date_str,
+                posted_date_str,
+                amount_cents,
+                "/".join(category_path),
+                level0,
+                level1,
+                level2,
+                categorization['status'],
+                transaction.description,
+                transaction.source,
+                source_label
+            ))
+
+        with self.connection:
+            self.connection.executemany(UPSERT, rows)
+
+        return len(rows)
+
+    def query(self, category=None, start=None, end=None, source=None, source_label=None,
+              min_amount=None, max_amount=None):
+        """
+        Query stored transactions.
+
+        Args:
+            category: Category path such as 'Transport/Fuel'; includes sub-categories
+            start: Earliest effective date as 'YYYY-MM-DD' (inclusive)
+            end: Latest effective date as 'YYYY-MM-DD' (inclusive)
+            source: Exact source account (empty for formats without one)
+            source_label: Exact label the transactions were stored with, e.g. parse_csv.py --source
+            min_amount: Smallest amount (inclusive)
+            max_amount: Largest amount (inclusive)
+
+        Returns:
+            list: dicts with the stored columns, 'amount' as a Decimal, ordered by effective date
+        """
+        conditions = []
+        params = []
+
+        if category:
+            category = category.strip("/")
+            # Range on the prefix keeps the category index usable for sub-categories
+            conditions.append("(category = ? OR (category >= ? AND category < ?))")
+            params.extend([category, category + "/", category + "0"])
+        if start:
+            conditions.append("effective_date >= ?")
+            params.append(start)
+        if end:
+            conditions.append("effective_date <= ?")
+            params.append(end)
+        if source is not None:
+            conditions.append("source = ?")
+            params.append(source)
+        if source_label is not None:
+            conditions.append("source_label = ?")
+            params.append(source_label)
+        if min_amount is not None:
+            conditions.append("amount_cents >= ?")
+            params.append(CsvHandler.to_cents(min_amount))
+        if max_amount is not None:
+            conditions.append("amount_cents <= ?")
+            params.append(CsvHandler.to_cents(max_amount))
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM transactions"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY effective_date, posted_date"
+
+        results = []
+        for row in self.connection.execute(sql, params):
+            result = dict(zip(COLUMNS, row))
+            result['amount'] = Decimal(result.pop('amount_cents')).scaleb(-2)
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _row_id(natural_key, occurrence):
+        """Derive a stable primary key from a transaction's identifying fields."""
+        key = "\x1f".join(str(part) for part in natural_key + (occurrence,))
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
@@ -1,96 +1,106 @@
 #!/user/bin/python
 #import sys
 import time, datetime
+import functools
 from decimal import Decimal
 import re
 
 #descriptionRe = re.compile('VISA PURCHASE   (.*)[0-9]{2}/[0-9]{2} AU AUD')
 
+# Raw field names for each supported row length
+FIELD_NAMES = {
+    # loans.com.au
+    6: ("Posted date", "Effective date", "Description", "Debit", "Credit", "Balance"),
+    # ubank old
+    5: ("Blank", "Posted date", "Description", "Accounting string", "Balance"),
+    # ubank new, from "activity" view
+    10: ("Date/time", "Description", "Debit", "Credit", "From account", "To account", "Payment type", "Category", "Receipt number", "Transaction ID"),
+}
+
+# ubank activity fields appended to the description as "name: value" pairs
+UBANK_DETAIL_FIELDS = ("From account", "To account", "Payment type", "Category", "Receipt number", "Transaction ID")
+
+@functools.lru_cache(maxsize=4096)
+def _parseDate(dateStr):
+  # datetimes are immutable, so rows with the same date string can share one
+  formats = ["%d/%m/%Y", "%H:%M %d-%m-%y"]
+  for format_str in formats:
+      try:
+          return datetime.datetime.strptime(dateStr, format_str)
+      except ValueError:
+          pass
+  raise ValueError('no valid date format found')
+
 class Transaction:
+  """
+  A single bank row. Only the raw row is kept up front; description, dates,
+  amount and source are built on first access and cached. Any of them can be
+  assigned to override the computed value.
+  """
+
   def __init__(self, inRow):
+    if len(inRow) not in FIELD_NAMES:
+        raise ValueError(f"unsupported number of fields: {len(inRow)}")
+    self.row = inRow
+
+  @functools.cached_property
+  def rawFields(self):
+    return dict(zip(FIELD_NAMES[len(self.row)], self.row))
+
+  @property
+  def rawDescription(self):
+    # the bank's own description, without the ubank "name: value" details
+    return self.row[1] if len(self.row) == 10 else self.row[2]
+
+  @functools.cached_property
+  def description(self):
+    if len(self.row) == 10:
+        fields = self.rawFields
+        return self.rawDescription + "; " + "; ".join(f"{name}: {fields[name]}" for name in UBANK_DETAIL_FIELDS if fields[name])
+    return self.rawDescription
+
+  @functools.cached_property
+  def amount(self):
+    fields = self.rawFields
+    if len(self.row) == 6:
+        return self.__flipSign(fields["Debit"] or fields["Credit"])
+    if len(self.row) == 5:
+        return self.__flipSign(fields["Accounting string"])
+    if fields["Debit"]:
+        return Decimal(self.__parseCurrency(fields["Debit"]))
+    return Decimal(self.__parseCurrency(fields["Credit"])) * -1
+
+  @functools.cached_property
+  def source(self):
+    if len(self.row) == 10:
+        fields = self.rawFields
+        return fields["From account"] if fields["Debit"] else fields["To account"]
+    return ""
+
+  @functools.cached_property
+  def postedDate(self):
+    # ubank only shows one "transaction date"
+    return self.__formatDate(self.row[0] if len(self.row) != 5 else self.row[1])
+
+  @functools.cached_property
+  def effectiveDate(self):
+    if len(self.row) == 6 and self.row[1]:
+        return self.__formatDate(self.row[1])
+    return self.postedDate
 
-    self.source = ""
-    if len(inRow) == 6:
-        # loans.com.au
-        (postedDateRaw, effectiveDateRaw, description, debit, credit, balance) = inRow
-        amount = self.__flipSign(debit or credit)
-    if len(inRow) == 5:
-        # ubank old
-        (blank, postedDateRaw, description, accountingStr, balance) = inRow
-        effectiveDateRaw = postedDateRaw # ubank only shows one "transaction date"
-        amount = self.__flipSign(accountingStr)
-    if len(inRow) == 10:
-        # ubank new, from "activity" view
-        (dateAndTime, descriptionRaw, debit, credit, fromAccount, toAccount, paymentType, category, receiptNumber, transactionId) = inRow
-
-        description = descriptionRaw + "; " + "; ".join(f"{name}: {value}" for name, value in [("From account", fromAccount), ("To account", toAccount), ("Payment type", paymentType), ("Category", category), ("Receipt number", receiptNumber), ("Transaction ID", transactionId)] if value)
-
-        # set amount
-        if debit:
-            amount = Decimal(self.__parseCurrency(debit))
-            self.source = fromAccount
-        else:
-            amount = Decimal(self.__parseCurrency(credit)) * -1
-            self.source = toAccount
-
-        # ubank only shows one "transaction date"
-        postedDateRaw = dateAndTime
-        effectiveDateRaw = dateAndTime
-        
-    self.postedDate = self.__formatDate(postedDateRaw)
-    self.effectiveDate = self.__formatDate(effectiveDateRaw or postedDateRaw)
-    self.description = description
-    self.amount = amount
-  
   def __parseCurrency(self, currencyStr):
     return currencyStr.replace("$", "").replace(",", "")
 
   def __formatDate(self, dateStr):
-    formats = ["%d/%m/%Y", "%H:%M %d-%m-%y"]
-    for format_str in formats:
-        try:
-            return datetime.datetime.strptime(dateStr, format_str)
-            break
-        except ValueError:
-            pass
-    raise ValueError('no valid date format found')
+    return _parseDate(dateStr)
 
   def __flipSign(self, accountingStr):
       return Decimal(re.sub(r'[^\d.-]', '', accountingStr.strip())) * -1
 
   def getPurposes(self, purposesMap):
-    matches = []
-    self.__getPurposes(purposesMap, matches)
-    return matches
-
-  def __getPurposes(self, purposesMap, matches):
-    for purpose, value in purposesMap.items():
-      path = [purpose]
-
-      if hasattr(value, 'items'):
-        self.__innerGetPurposes(value, matches, path)
-      else:
-        for pattern in value:
-          #print "-> re", re
-          #print "-> re.pattern: ", re.pattern, "<"
-          if re.search(pattern, self.description, re.IGNORECASE):
-            #print "-> match", pattern
-            matches.append(path)
-
-  def __innerGetPurposes(self, purposesMap, matches, path):
-    for purpose, value in purposesMap.items():
-      #revert: path.append(purpose)
-      p = path + [purpose]
-
-      if hasattr(value, 'items'):
-        self.__innerGetPurposes(value, matches, p)
-      else:
-        for pattern in value:
-          if re.search(pattern, self.description, re.IGNORECASE):
-            #print "-> match (", pattern.pattern, "); ",self.description
-            #print "--> p: ",p
-            matches.append(p)
+    # kept for callers of the old API; the categorizer owns the matching rules
+    from .categorizer import TransactionCategorizer
+    return TransactionCategorizer(purposesMap).categorize_transaction(self)['categories']
 
   def __str__(self):
     return str.join(", ", [self.effectiveDate.strftime("%d/%m/%Y"), self.postedDate.strftime("%d/%m/%Y"), self.description, str(self.amount)])
-
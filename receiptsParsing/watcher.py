@@ -0,0 +1,129 @@
+"""
+Input folder watching - detects new or changed exports and hands them over in batches.
+
+Uses inotify through the optional inotify_simple package when it is installed,
+otherwise polls the directory.
+"""
+import os
+import time
+import fnmatch
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+
+class InputWatcher:
+    """Watches a directory and reports new or changed files once they stop changing."""
+
+    def __init__(self, directory, callback, patterns=('*.csv', '*.csv.gz', '*.csv.bz2', '*.csv.xz', '*.zip'), debounce=2.0, poll_interval=1.0,
+                 process_existing=False, use_inotify=True):
+        """
+        Initialize the watcher.
+
+        Args:
+            directory: Directory to watch
+            callback: Called with a sorted list of file paths for each settled batch
+            patterns: Glob patterns of file names to watch
+            debounce: Seconds without further changes before a batch is handed over
+            poll_interval: Seconds between directory scans when inotify is unavailable
+            process_existing: Whether files already present at start count as new
+            use_inotify: Set False to force polling
+        """
+        self.directory = directory
+        self.callback = callback
+        self.patterns = patterns
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.pending = set()
+        self.last_change = None
+        self._seen = {}
+        self._inotify = None
+
+        if use_inotify and inotify_simple is not None:
+            self._inotify = inotify_simple.INotify()
+            flags = inotify_simple.flags
+            self._inotify.add_watch(directory, flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.MODIFY)
+
+        if not process_existing:
+            self.scan()
+            self.pending.clear()
+            self.last_change = None
+
+    @property
+    def using_inotify(self):
+        """Whether the watcher is woken by inotify rather than polling."""
+        return self._inotify is not None
+
+    def scan(self):
+        """
+        Compare the directory against the last scan and record changed files as pending.
+
+        Returns:
+            list: Paths that are new or changed since the last scan
+        """
+        changed = []
+
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or not any(fnmatch.fnmatch(entry.name, p) for p in self.patterns):
+                continue
+            stat = entry.stat()
+            fingerprint = (stat.st_size, stat.st_mtime_ns)
+            if self._seen.get(entry.path) != fingerprint:
+                self._seen[entry.path] = fingerprint
+                changed.append(entry.path)
+
+        if changed:
+            self.pending.update(changed)
+            self.last_change = time.monotonic()
+
+        return changed
+
+    def poll_once(self, timeout=None):
+        """
+        Wait for activity, rescan, and hand over the pending batch if it has settled.
+
+        Args:
+            timeout: Seconds to wait for activity; defaults to poll_interval
+
+        Returns:
+            list: The batch passed to the callback, or an empty list
+        """
+        timeout = self.poll_interval if timeout is None else timeout
+
+        if self._inotify is not None:
+            self._inotify.read(timeout=int(timeout * 1000))
+        elif timeout:
+            time.sleep(timeout)
+
+        self.scan()
+
+        if self.pending and time.monotonic() - self.last_change >= self.debounce:
+            batch = sorted(self.pending)
+            self.pending.clear()
+            self.callback(batch)
+            return batch
+
+        return []
+
+    def run(self, should_stop=None):
+        """
+        Watch until should_stop returns True (or forever).
+
+        Args:
+            should_stop: Optional callable checked between iterations
+        """
+        while not (should_stop and should_stop()):
+            # Wake up in time to flush a pending batch once it has settled
+            timeout = self.poll_interval
+            if self.pending:
+                remaining = self.debounce - (time.monotonic() - self.last_change)
+                timeout = max(0, min(timeout, remaining))
+            self.poll_once(timeout)
+
+    def close(self):
+        """Release the inotify handle, if any."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,67 @@
+#!/usr/bin/python
+import sys
+import difflib
+import argparse
+from receiptsParsing.snapshot_store import SnapshotStore
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Deduplicated snapshots of the out/ directory.")
+    parser.add_argument('--store', dest='store', default="bkp")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    create = commands.add_parser('create', help="Snapshot a directory")
+    create.add_argument('directory', nargs='?', default="out")
+
+    commands.add_parser('list', help="List snapshots")
+
+    diff = commands.add_parser('diff', help="Compare two snapshots")
+    diff.add_argument('oldId')
+    diff.add_argument('newId')
+    diff.add_argument('--rows', action='store_true', help="Show changed rows of changed files")
+
+    restore = commands.add_parser('restore', help="Restore a snapshot into a directory")
+    restore.add_argument('snapshotId')
+    restore.add_argument('destination')
+
+    args = parser.parse_args()
+    store = SnapshotStore(args.store)
+
+    try:
+        if args.command == 'create':
+            manifest = store.create(args.directory)
+            print(f"Snapshot {manifest['id']}: {len(manifest['files'])} files, "
+                  f"{manifest['new_blocks']} new blocks, {manifest['stored_bytes']} bytes stored")
+
+        elif args.command == 'list':
+            for manifest in store.snapshots():
+                size = sum(entry['size'] for entry in manifest['files'].values())
+                print(f"{manifest['id']}  {manifest['created']}  {len(manifest['files'])} files  "
+                      f"{size} bytes  ({manifest['stored_bytes']} bytes stored)")
+
+        elif args.command == 'diff':
+            result = store.diff(args.oldId, args.newId)
+            for path in result['added']:
+                print(f"added:   {path}")
+            for path in result['removed']:
+                print(f"removed: {path}")
+            for path, change in result['changed'].items():
+                print(f"changed: {path} ({change['old_size']} -> {change['new_size']} bytes, "
+                      f"+{change['added_blocks']}/-{change['removed_blocks']} blocks)")
+                if args.rows:
+                    old_rows = store.read_file(args.oldId, path).decode('utf-8').splitlines()
+                    new_rows = store.read_file(args.newId, path).decode('utf-8').splitlines()
+                    for line in difflib.unified_diff(old_rows, new_rows, args.oldId, args.newId, lineterm=''):
+                        print(f"  {line}")
+
+        elif args.command == 'restore':
+            for path in store.restore(args.snapshotId, args.destination):
+                print(f"restored: {path}")
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Unit tests for AnomalyDetector - testing streaming statistics and outlier flags.
+"""
+import random
+import statistics
+import unittest
+import tempfile
+import os
+import shutil
+from datetime import datetime, timedelta
+from decimal import Decimal
+from receiptsParsing.anomaly_detector import AnomalyDetector, P2Quantile, RollingStats
+
+
+class MockTransaction:
+    def __init__(self, desc, amount, date, source="Test Account"):
+        self.description = desc
+        self.amount = Decimal(str(amount))
+        self.effectiveDate = date
+        self.postedDate = date
+        self.source = source
+
+
+class TestRollingStats(unittest.TestCase):
+
+    def test_mean_and_variance(self):
+        """Test Welford updates against the statistics module."""
+        values = [10.0, 12.5, 9.0, 30.0, 11.0, 10.5]
+        stats = RollingStats()
+        for day, value in enumerate(values):
+            stats.add(value, day)
+
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.variance, statistics.variance(values))
+
+    def test_median_estimate(self):
+        """Test the P-square estimate is close to the true median."""
+        generator = random.Random(1)
+        values = [generator.gauss(100, 15) for _ in range(2000)]
+        quantile = P2Quantile(0.5)
+        for value in values:
+            quantile.add(value)
+
+        self.assertAlmostEqual(quantile.value, statistics.median(values), delta=2)
+
+    def test_frequency(self):
+        """Test transactions per 30 days."""
+        stats = RollingStats()
+        for day in (0, 30, 60):
+            stats.add(1.0, day)
+
+        self.assertAlmostEqual(stats.per_month, 1.5)
+
+    def test_frequency_out_of_order(self):
+        """Test the observed period spans the earliest and latest days in any order."""
+        stats = RollingStats()
+        for day in (60, 0, 30):
+            stats.add(1.0, day)
+
+        self.assertEqual((stats.first_day, stats.last_day), (0, 60))
+
+
+class TestAnomalyDetector(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a monthly utility bill history."""
+        self.start = datetime(2025, 1, 1)
+        self.items = [self._item("ELECTRICITY CO", 100 + month, month) for month in range(6)]
+
+    def test_outlier_is_flagged(self):
+        """Test a bill three times its usual amount is flagged for category and merchant."""
+        detector = AnomalyDetector()
+        detector.process(self._result(self.items))
+
+        flags = detector.process(self._result([self._item("ELECTRICITY CO", 320, 7)]))
+
+        self.assertEqual([flag['kind'] for flag in flags], ['category', 'merchant'])
+        self.assertEqual(flags[0]['key'], 'Bills/Electricity')
+        self.assertIn('median', flags[0]['reason'])
+
+    def test_usual_amount_not_flagged(self):
+        """Test ordinary amounts and short histories are not flagged."""
+        detector = AnomalyDetector()
+
+        self.assertEqual(detector.process(self._result(self.items[:2] + [self._item("ELECTRICITY CO", 900, 2)])), [])
+        self.assertEqual(detector.process(self._result([self._item("ELECTRICITY CO", 104, 8)])), [])
+
+    def test_state_round_trip_skips_seen_transactions(self):
+        """Test saved state continues counting without double-counting reprocessed rows."""
+        detector = AnomalyDetector()
+        detector.process(self._result(self.items))
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as temp_file:
+            temp_path = temp_file.name
+        try:
+            detector.save(temp_path)
+            restored = AnomalyDetector()
+            restored.load(temp_path)
+        finally:
+            os.unlink(temp_path)
+
+        restored.process(self._result(self.items + [self._item("ELECTRICITY CO", 101, 6)]))
+
+        stats = restored.stats['category']['Bills/Electricity']
+        self.assertEqual(stats.count, 7)
+
+    def test_older_months_are_counted(self):
+        """Test a run covering earlier months than the last one still adds them."""
+        detector = AnomalyDetector()
+        detector.process(self._result(self.items[3:]))
+
+        detector.process(self._result(self.items[:3]))
+
+        self.assertEqual(detector.stats['category']['Bills/Electricity'].count, 6)
+
+    def test_second_source_is_counted(self):
+        """Test an identical row from another account is a different transaction."""
+        detector = AnomalyDetector()
+        detector.process(self._result(self.items))
+
+        detector.process(self._result([self._item("ELECTRICITY CO", 105, 5, source="Other Account")]))
+
+        self.assertEqual(detector.stats['category']['Bills/Electricity'].count, 7)
+
+    def test_identical_rows_in_one_run_are_counted(self):
+        """Test equal rows in one run are all counted, and counted once across runs."""
+        detector = AnomalyDetector()
+        items = [self._item("ELECTRICITY CO", 100, 0), self._item("ELECTRICITY CO", 100, 0)]
+
+        detector.process(self._result(items))
+        detector.process(self._result(items))
+
+        self.assertEqual(detector.stats['category']['Bills/Electricity'].count, 2)
+
+    def test_refund_is_not_counted(self):
+        """Test credits are neither flagged nor added to spend statistics."""
+        detector = AnomalyDetector()
+        detector.process(self._result(self.items))
+
+        flags = detector.process(self._result([self._item("ELECTRICITY CO", -900, 6)]))
+
+        stats = detector.stats['category']['Bills/Electricity']
+        self.assertEqual(flags, [])
+        self.assertEqual(stats.count, 6)
+        self.assertGreater(stats.mean, 100)
+
+    def test_row_keys_outside_retention_are_pruned(self):
+        """Test old row keys are dropped and transactions that old are not recounted."""
+        detector = AnomalyDetector(retention_days=60)
+        detector.process(self._result(self.items))
+
+        detector.process(self._result(self.items[:1]))
+
+        self.assertEqual(sorted(detector.seen), ['2025-04-01', '2025-05-01', '2025-05-31'])
+        self.assertEqual(detector.stats['category']['Bills/Electricity'].count, 6)
+
+    def test_save_replaces_state_file(self):
+        """Test saving over an existing state leaves a loadable file and no temporary file."""
+        detector = AnomalyDetector()
+        detector.process(self._result(self.items))
+        directory = tempfile.mkdtemp()
+        state_path = os.path.join(directory, 'state.json')
+
+        try:
+            detector.save(state_path)
+            detector.save(state_path)
+            restored = AnomalyDetector()
+            restored.load(state_path)
+
+            self.assertEqual(os.listdir(directory), ['state.json'])
+            self.assertEqual(restored.seen, detector.seen)
+        finally:
+            shutil.rmtree(directory)
+
+    def _item(self, desc, amount, month, source="Test Account"):
+        """Helper to create a categorized result item."""
+        return {
+            'transaction': MockTransaction(desc, amount, self.start + timedelta(days=30 * month), source),
+            'categorization': {'status': 'matched', 'selected_category': ['Bills', 'Electricity']}
+        }
+
+    def _result(self, items):
+        """Helper to wrap items as a processor result."""
+        return {'categorized': items, 'multiple_matches': [], 'unmatched': [], 'filtered_out': 0}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Integration tests for BatchRunner - testing job execution and matcher sharing.
+"""
+import unittest
+import tempfile
+import shutil
+import csv
+import os
+from receiptsParsing.batch_runner import BatchRunner
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary directory with configs and an input file."""
+        self.directory = tempfile.mkdtemp()
+        self.config_a = self._write('config_a.py', "purposesMap = {'Bills': {'Health': ['PHARMACY']}}\n")
+        self.config_b = self._write('config_b.py', "purposesMap = {'Bills': {'Health': ['PHARMACY']}}\n")
+        self.config_c = self._write('config_c.py', "purposesMap = {'Health': ['PHARMACY'], 'Food': ['COLES']}\n")
+        self.input = self._write('in.csv',
+                                 '12:34 01-01-25,PHARMACY GUILD,,10.50,Test Account,,Visa,Health,123,789\n'
+                                 '12:34 02-01-25,COLES,,5.00,Test Account,,Visa,Food,124,790\n')
+        self.runner = BatchRunner(max_workers=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_jobs_write_outputs(self):
+        """Test each job writes its own categorized output."""
+        results = self.runner.run([
+            self._job(self.config_a, 'out_a.csv'),
+            self._job(self.config_c, 'out_c.csv'),
+        ])
+
+        self.assertEqual([result['status'] for result in results], ['ok', 'ok'])
+        self.assertEqual(results[0]['counts']['unmatched'], 1)
+        self.assertEqual(results[1]['counts']['categorized'], 2)
+        with open(os.path.join(self.directory, 'out_c.csv')) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual([row[3] for row in rows], ['Health', 'Food'])
+        self.assertIn('write', results[0]['timings'])
+
+    def test_identical_configs_share_processor(self):
+        """Test identical configurations reuse one processor and overlapping ones share patterns."""
+        processor_a = self.runner.processor_for(self.config_a)
+        processor_b = self.runner.processor_for(self.config_b)
+        processor_c = self.runner.processor_for(self.config_c)
+
+        self.assertIs(processor_a, processor_b)
+        self.assertIsNot(processor_a, processor_c)
+        self.assertIs(processor_a.categorizer.rules[0].description, processor_c.categorizer.rules[0].description)
+
+    def test_failing_job_is_reported(self):
+        """Test a failing job reports its stage without stopping the others."""
+        missing = self._job(self.config_a, 'out_missing.csv')
+        missing['inputs'] = [os.path.join(self.directory, 'missing.csv')]
+
+        results = self.runner.run([missing, self._job(self.config_a, 'out_a.csv')])
+
+        self.assertEqual(results[0]['status'], 'error')
+        self.assertTrue(results[0]['error'].startswith('read:'))
+        self.assertEqual(results[1]['status'], 'ok')
+
+    def _job(self, config, output):
+        """Helper to create a job dict."""
+        return {
+            'config': config,
+            'inputs': [self.input],
+            'output': os.path.join(self.directory, output),
+            'source': 'TestBank'
+        }
+
+    def _write(self, name, content):
+        """Helper to write a file into the temporary directory."""
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+
+if __name__ == '__main__':
+    unittest.main()
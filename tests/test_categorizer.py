@@ -92,6 +92,43 @@ class TestTransactionCategorizer(unittest.TestCase):
         self.assertEqual(result['status'], 'matched')
         self.assertEqual(result['selected_category'], ['Groceries'])
     
+    def test_matches_come_out_in_configuration_order(self):
+        """Test all matching categories are listed in the order of the mapping."""
+        transaction = self._create_transaction('PHARMACY VAYA COLES TRANSLINK')
+        
+        result = self.categorizer.categorize_transaction(transaction)
+        
+        self.assertEqual(result['categories'], [
+            ['Bills', 'Health'], ['Bills', 'Telecom', 'Mobile'], ['Groceries'], ['Transport', 'Public']
+        ])
+    
+    def test_get_purposes_delegates_to_categorizer(self):
+        """Test Transaction.getPurposes supports structured rules through the categorizer."""
+        structured_map = {'Bills': [{'description': 'COUNCIL', 'amount': (None, 0)}], 'Other': ['COUNCIL']}
+        transaction = self._create_transaction('COUNCIL RATES')
+        
+        self.assertEqual(transaction.getPurposes(structured_map), [['Bills'], ['Other']])
+    
+    def test_structured_rules_combine_with_patterns(self):
+        """Test dict rules and plain patterns categorize together."""
+        structured_map = {
+            'Bills': {
+                'Rates': [
+                    {'fields': {'Payment type': 'BPAY'}, 'amount': (-900, -400)}
+                ],
+                'Health': ['PHARMACY']
+            }
+        }
+        categorizer = TransactionCategorizer(structured_map)
+        
+        bpay = self._create_transaction('COUNCIL')
+        bpay.rawFields['Payment type'] = 'BPAY'
+        bpay.amount = -500
+        
+        self.assertEqual(categorizer.categorize_transaction(bpay)['selected_category'], ['Bills', 'Rates'])
+        self.assertEqual(categorizer.categorize_transaction(self._create_transaction('PHARMACY'))['selected_category'],
+                         ['Bills', 'Health'])
+    
     
     def _create_transaction(self, description, amount=-10.50):
         """Helper to create test transaction."""
@@ -0,0 +1,119 @@
+"""
+Unit tests for ColumnarHandler - testing typed and dictionary-encoded columns.
+"""
+import unittest
+import tempfile
+import os
+from datetime import datetime
+from decimal import Decimal
+from receiptsParsing.columnar_handler import ColumnarHandler, numpy, pyarrow
+
+
+class MockTransaction:
+    def __init__(self, desc, amount, date=datetime(2025, 1, 15), source="Test Account"):
+        self.description = desc
+        self.amount = Decimal(str(amount))
+        self.effectiveDate = date
+        self.postedDate = date
+        self.source = source
+
+
+class TestColumnarHandler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up transaction items covering each categorization outcome."""
+        self.items = [
+            {
+                'transaction': MockTransaction("PHARMACY PURCHASE", "-25.50"),
+                'categorization': {'status': 'matched', 'selected_category': ['Bills', 'Health']}
+            },
+            {
+                'transaction': MockTransaction("UNKNOWN MERCHANT", "-15.005", source=""),
+                'categorization': {'status': 'no_match', 'selected_category': None}
+            },
+            {
+                'transaction': MockTransaction("CHEMIST", "-4", date=datetime(1970, 1, 2)),
+                'categorization': {'status': 'matched', 'selected_category': ['Bills', 'Health']}
+            },
+        ]
+
+    def test_dates_are_days_since_epoch(self):
+        """Test dates are converted to whole days."""
+        columns = ColumnarHandler.build_columns(self.items, "TestBank")
+
+        self.assertEqual(columns['effective_date'][2], 1)
+        self.assertEqual(columns['posted_date'][0], (datetime(2025, 1, 15) - datetime(1970, 1, 1)).days)
+
+    def test_amounts_are_integer_cents(self):
+        """Test amounts are converted to rounded integer cents."""
+        columns = ColumnarHandler.build_columns(self.items, "TestBank")
+
+        self.assertEqual(columns['amount_cents'], [-2550, -1501, -400])
+
+    def test_category_levels_are_dictionary_encoded(self):
+        """Test category levels share codes and use TODO for unmatched."""
+        columns = ColumnarHandler.build_columns(self.items, "TestBank")
+
+        self.assertEqual(columns['category_level0'], [0, 1, 0])
+        self.assertEqual(columns['category_level0_dictionary'], ['Bills', 'TODO'])
+        self.assertEqual(columns['category_level1_dictionary'], ['Health', ''])
+        self.assertEqual(columns['category_level2_dictionary'], [''])
+
+    def test_source_column_matches_csv(self):
+        """Test source labelling matches the CSV writer."""
+        columns = ColumnarHandler.build_columns(self.items, "TestBank")
+
+        self.assertEqual(columns['source'][0], "Test Account (TestBank)")
+        self.assertEqual(columns['source'][1], "TestBank")
+
+    def test_missing_source_label_is_empty(self):
+        """Test a missing source label becomes an empty string, as in the CSV output."""
+        columns = ColumnarHandler.build_columns(self.items, None)
+
+        self.assertEqual(columns['source'][1], "")
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_write_npz_round_trip(self):
+        """Test the NumPy fallback writes typed columns."""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.npz') as temp_file:
+            temp_path = temp_file.name
+
+        try:
+            ColumnarHandler.write_transactions(temp_path, self.items, None, 'npz')
+
+            with numpy.load(temp_path) as data:
+                self.assertEqual(str(data['effective_date'][0]), '2025-01-15')
+                self.assertEqual(list(data['amount_cents']), [-2550, -1501, -400])
+                self.assertEqual(list(data['category_level0_dictionary']), ['Bills', 'TODO'])
+                self.assertEqual(str(data['source'][1]), '')
+        finally:
+            os.unlink(temp_path)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_write_parquet_round_trip(self):
+        """Test Parquet output has date, integer and dictionary column types."""
+        import pyarrow.parquet
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.parquet') as temp_file:
+            temp_path = temp_file.name
+
+        try:
+            ColumnarHandler.write_transactions(temp_path, self.items, "TestBank", 'parquet')
+
+            table = pyarrow.parquet.read_table(temp_path)
+            self.assertEqual(table.schema.field('effective_date').type, pyarrow.date32())
+            self.assertEqual(table.column('amount_cents').to_pylist(), [-2550, -1501, -400])
+            self.assertTrue(pyarrow.types.is_dictionary(table.schema.field('category_level0').type))
+            self.assertEqual(table.column('category_level0').to_pylist(), ['Bills', 'TODO', 'Bills'])
+        finally:
+            os.unlink(temp_path)
+
+    @unittest.skipIf(pyarrow is not None, "pyarrow installed")
+    def test_parquet_without_pyarrow_raises_clear_error(self):
+        """Test requesting Parquet without pyarrow names the missing package."""
+        with self.assertRaisesRegex(RuntimeError, "pyarrow"):
+            ColumnarHandler.write_transactions("unused.parquet", self.items, "TestBank", 'parquet')
+
+
+if __name__ == '__main__':
+    unittest.main()
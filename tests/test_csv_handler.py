@@ -14,7 +14,7 @@ class TestCsvHandler(unittest.TestCase):
         """Test category level formatting with 3-level path."""
         category_path = ['Bills', 'Telecom', 'Mobile']
         
-        levels = CsvHandler._format_category_levels(category_path)
+        levels = CsvHandler.format_category_levels(category_path)
         
         self.assertEqual(levels, ('Bills', 'Telecom', 'Mobile'))
     
@@ -22,7 +22,7 @@ class TestCsvHandler(unittest.TestCase):
         """Test category level formatting with partial path."""
         category_path = ['Groceries']
         
-        levels = CsvHandler._format_category_levels(category_path)
+        levels = CsvHandler.format_category_levels(category_path)
         
         self.assertEqual(levels, ('Groceries', '', ''))
     
@@ -30,7 +30,7 @@ class TestCsvHandler(unittest.TestCase):
         """Test category level formatting with TODO path."""
         category_path = ['TODO']
         
-        levels = CsvHandler._format_category_levels(category_path)
+        levels = CsvHandler.format_category_levels(category_path)
         
         self.assertEqual(levels, ('TODO', '', ''))
 
@@ -105,6 +105,153 @@ class TestCsvHandler(unittest.TestCase):
         finally:
             os.unlink(temp_path)
 
+    def test_merge_transactions_adds_only_new_rows(self):
+        """Test merging skips rows already in the file and keeps posted date order."""
+        from datetime import datetime
+        from decimal import Decimal
+        
+        class MockTransaction:
+            def __init__(self, desc, amount, day):
+                self.description = desc
+                self.amount = Decimal(str(amount))
+                self.effectiveDate = datetime(2025, 1, day)
+                self.postedDate = datetime(2025, 1, day)
+                self.source = "Test Account"
+        
+        def item(desc, amount, day):
+            return {
+                'transaction': MockTransaction(desc, amount, day),
+                'categorization': {'status': 'matched', 'selected_category': ['Groceries']}
+            }
+        
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as temp_file:
+            temp_path = temp_file.name
+        
+        try:
+            CsvHandler.write_transactions(temp_path, [item("SECOND", "-2.00", 20)], "TestBank")
+            
+            added = CsvHandler.merge_transactions(
+                temp_path,
+                [item("FIRST", "-1.00", 10), item("SECOND", "-2.00", 20)],
+                "TestBank"
+            )
+            
+            with open(temp_path, 'r') as file:
+                rows = list(csv.reader(file))
+            
+            self.assertEqual(added, 1)
+            self.assertEqual([row[6] for row in rows], ["FIRST", "SECOND"])
+            
+            # Identical rows within one batch are all kept, as write_transactions does
+            os.unlink(temp_path)
+            coffee = item("COFFEE", "-4.50", 5)
+            added = CsvHandler.merge_transactions(temp_path, [coffee, coffee], "TestBank")
+            self.assertEqual(added, 2)
+            
+            # Re-merging the same batch adds nothing
+            added = CsvHandler.merge_transactions(temp_path, [coffee, coffee], "TestBank")
+            self.assertEqual(added, 0)
+            
+            # Without a source label, rows match what write_transactions wrote
+            os.unlink(temp_path)
+            unlabelled = item("TEA", "-3.00", 6)
+            unlabelled['transaction'].source = ""
+            CsvHandler.write_transactions(temp_path, [unlabelled], None)
+            added = CsvHandler.merge_transactions(temp_path, [unlabelled], None)
+            with open(temp_path, 'r') as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(added, 0)
+            self.assertEqual(rows[0][-1], "")
+            
+        finally:
+            os.unlink(temp_path)
+
+    def test_read_compressed_and_archived_files(self):
+        """Test gzip, bz2, xz and zip inputs are read like plain CSV."""
+        import gzip
+        import bz2
+        import lzma
+        import zipfile
+        import shutil
+        
+        content = "12:34 01-01-25,PHARMACY,,10.50\n12:35 01-01-25,COLES,,5.00\n"
+        directory = tempfile.mkdtemp()
+        
+        try:
+            paths = [os.path.join(directory, 'plain.csv')]
+            with open(paths[0], 'w') as f:
+                f.write(content)
+            for suffix, opener in (('.csv.gz', gzip.open), ('.csv.bz2', bz2.open), ('.csv.xz', lzma.open)):
+                paths.append(os.path.join(directory, 'in' + suffix))
+                with opener(paths[-1], 'wt') as f:
+                    f.write(content)
+            paths.append(os.path.join(directory, 'in.zip'))
+            with zipfile.ZipFile(paths[-1], 'w', zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr('a.csv', content)
+                archive.writestr('b.csv', content)
+            
+            expected = [row for row in csv.reader(content.splitlines())] * 6
+            
+            self.assertEqual(CsvHandler.read_csv_files(paths), expected)
+            self.assertEqual(CsvHandler.read_csv_files(paths, max_workers=3), expected)
+            
+        finally:
+            shutil.rmtree(directory)
+
+    def test_read_zip_skips_non_csv_members(self):
+        """Test only CSV members of a zip are read, including compressed ones."""
+        import gzip
+        import zipfile
+        
+        content = '12:34 01-01-25,"PHARMACY\r\nCHEMIST",,10.50\r\n'
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
+            temp_path = temp_file.name
+        
+        try:
+            with zipfile.ZipFile(temp_path, 'w') as archive:
+                archive.writestr('__MACOSX/._a.csv', b'\x00\x05\x16\x07\xff\xfe')
+                archive.writestr('.hidden.csv', content)
+                archive.writestr('README.txt', 'Exported statements\n')
+                archive.writestr('statements/', '')
+                archive.writestr('statements/a.csv', content)
+                archive.writestr('statements/B.CSV.GZ', gzip.compress(content.encode('utf-8')))
+            
+            rows = CsvHandler.read_csv_files([temp_path])
+            
+            self.assertEqual(rows, [["12:34 01-01-25", "PHARMACY\r\nCHEMIST", "", "10.50"]] * 2)
+            
+        finally:
+            os.unlink(temp_path)
+
+
+    def test_quoted_line_break_same_in_every_container(self):
+        """Test a CRLF inside a quoted field reads the same from plain, gzip and zip files."""
+        import gzip
+        import zipfile
+        import shutil
+        
+        content = b'12:34 01-01-25,"PHARMACY\r\nCHEMIST",,10.50\r\n'
+        directory = tempfile.mkdtemp()
+        
+        try:
+            plain_path = os.path.join(directory, 'in.csv')
+            with open(plain_path, 'wb') as f:
+                f.write(content)
+            gzip_path = os.path.join(directory, 'in.csv.gz')
+            with open(gzip_path, 'wb') as f:
+                f.write(gzip.compress(content))
+            zip_path = os.path.join(directory, 'in.zip')
+            with zipfile.ZipFile(zip_path, 'w') as archive:
+                archive.writestr('in.csv', content)
+            
+            expected = [["12:34 01-01-25", "PHARMACY\r\nCHEMIST", "", "10.50"]]
+            
+            for path in (plain_path, gzip_path, zip_path):
+                self.assertEqual(CsvHandler.read_csv_files([path]), expected, path)
+            
+        finally:
+            shutil.rmtree(directory)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
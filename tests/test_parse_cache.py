@@ -0,0 +1,158 @@
+"""
+Unit tests for ParseCache - testing cache hits, invalidation and parse equivalence.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+from receiptsParsing.parse_cache import ParseCache, CACHE_VERSION
+from receiptsParsing.csv_handler import CsvHandler
+from receiptsParsing.processor import TransactionProcessor
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up an input file, a processor and a cache directory."""
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.directory, 'cache')
+        self.input = os.path.join(self.directory, 'in.csv')
+        self._write_input(
+            '12:34 01-01-25,JOURNAL CREDIT TEST,,0.00,Test Account,,Internal,Transfer,123,789\n'
+            '12:34 01-01-25,PHARMACY PURCHASE,,25.50,Test Account,,Visa,Health,124,790\n'
+            'too,few,fields\n'
+        )
+        self.processor = TransactionProcessor({'Bills': {'Health': ['PHARMACY']}})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_second_run_hits_cache(self):
+        """Test an unchanged file is loaded from the cache with the same result."""
+        first = ParseCache(self.cache_dir).parse_files([self.input], self.processor)
+
+        cache = ParseCache(self.cache_dir)
+        second = cache.parse_files([self.input], self.processor)
+
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertEqual(len(second['transactions']), 1)
+        self.assertEqual(second['errors'], first['errors'])
+        transaction = second['transactions'][0]
+        self.assertEqual(transaction.description, first['transactions'][0].description)
+        self.assertIn("JOURNAL CREDIT TEST", transaction.description)
+        self.assertEqual(transaction.amount, first['transactions'][0].amount)
+        self.assertIn('postedDate', vars(transaction))
+
+    def test_changed_file_is_reparsed(self):
+        """Test changing the content invalidates the cached parse."""
+        ParseCache(self.cache_dir).parse_files([self.input], self.processor)
+        self._write_input('12:34 02-01-25,COLES,,5.00,Test Account,,Visa,Food,125,791\n')
+
+        cache = ParseCache(self.cache_dir)
+        result = cache.parse_files([self.input], self.processor)
+
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertIn("COLES", result['transactions'][0].description)
+
+    def test_touched_file_reuses_content_hash(self):
+        """Test a new mtime with identical content still hits the cache."""
+        ParseCache(self.cache_dir).parse_files([self.input], self.processor)
+        os.utime(self.input, ns=(0, 0))
+
+        cache = ParseCache(self.cache_dir)
+        cache.parse_files([self.input], self.processor)
+
+        self.assertEqual(cache.hits, 1)
+
+    def test_cached_transactions_categorize(self):
+        """Test cached transactions go through processing like fresh ones."""
+        ParseCache(self.cache_dir).parse_files([self.input], self.processor)
+        parse_result = ParseCache(self.cache_dir).parse_files([self.input], self.processor)
+
+        result = self.processor.process_transactions(parse_result['transactions'])
+
+        self.assertEqual(len(result['categorized']), 1)
+
+    def test_journal_credit_carries_into_next_file(self):
+        """Test a journal credit ending one file prefixes the next file's first transaction, as without the cache."""
+        second_input = os.path.join(self.directory, 'in2.csv')
+        self._write_input(
+            '12:34 01-01-25,PHARMACY PURCHASE,,25.50,Test Account,,Visa,Health,124,790\n'
+            '12:35 01-01-25,JOURNAL CREDIT TEST,,0.00,Test Account,,Internal,Transfer,125,791\n'
+        )
+        with open(second_input, 'w') as f:
+            f.write('12:36 02-01-25,REFUND,,25.50,Test Account,,Internal,Transfer,126,792\n')
+        paths = [self.input, second_input]
+
+        uncached = self.processor.parse_csv_rows(CsvHandler.read_csv_files(paths))
+        ParseCache(self.cache_dir).parse_files(paths, self.processor)
+        cached = ParseCache(self.cache_dir).parse_files(paths, self.processor, max_workers=2)
+
+        self.assertEqual([t.description for t in cached['transactions']],
+                         [t.description for t in uncached['transactions']])
+        self.assertIn("JOURNAL CREDIT TEST", cached['transactions'][1].description)
+        self.assertEqual(cached['journal_credits'], [])
+        self.assertEqual(cached['errors'], uncached['errors'])
+
+    def test_carried_credit_warnings_keep_row_order(self):
+        """Test warnings for credits carried into a file come out where the uncached parse reports them."""
+        second_input = os.path.join(self.directory, 'in2.csv')
+        self._write_input(
+            '12:35 01-01-25,JOURNAL CREDIT FIRST,,0.00,Test Account,,Internal,Transfer,125,791\n'
+        )
+        with open(second_input, 'w') as f:
+            f.write(
+                'too,few,fields\n'
+                '12:36 02-01-25,JOURNAL CREDIT SECOND,,0.00,Test Account,,Internal,Transfer,126,792\n'
+                '12:37 02-01-25,PHARMACY PURCHASE,25.50,,Test Account,,Visa,Health,127,793\n'
+                'still,too,few\n'
+            )
+        paths = [self.input, second_input]
+
+        uncached = self.processor.parse_csv_rows(CsvHandler.read_csv_files(paths))
+        first_run = ParseCache(self.cache_dir).parse_files(paths, self.processor)
+        second_run = ParseCache(self.cache_dir).parse_files(paths, self.processor)
+
+        self.assertEqual(len(uncached['errors']), 4)
+        self.assertEqual(first_run['errors'], uncached['errors'])
+        self.assertEqual(second_run['errors'], uncached['errors'])
+        self.assertEqual(second_run['first_transaction_errors'], uncached['first_transaction_errors'])
+
+    def test_entries_of_edited_and_deleted_files_are_pruned(self):
+        """Test the cache keeps one entry per input still on disk."""
+        other_input = os.path.join(self.directory, 'other.csv')
+        with open(other_input, 'w') as f:
+            f.write('12:34 02-01-25,COLES,,5.00,Test Account,,Visa,Food,125,791\n')
+        ParseCache(self.cache_dir).parse_files([self.input, other_input], self.processor)
+
+        self._write_input('12:34 03-01-25,WOOLWORTHS,,7.00,Test Account,,Visa,Food,126,792\n')
+        os.unlink(other_input)
+        cache = ParseCache(self.cache_dir)
+        cache.parse_files([self.input], self.processor)
+
+        entries = [name for name in os.listdir(self.cache_dir) if name.endswith('.pickle')]
+        self.assertEqual(entries, [f"{cache.fingerprint(self.input)}.v{CACHE_VERSION}.pickle"])
+
+    def test_parallel_reads_keep_file_order(self):
+        """Test uncached files read on several threads are combined in input order."""
+        paths = []
+        for i in range(4):
+            paths.append(os.path.join(self.directory, f'in{i}.csv'))
+            with open(paths[-1], 'w') as f:
+                f.write(f'12:34 0{i + 1}-01-25,SHOP {i},,1.00,Test Account,,Visa,Food,{i},{i}\n')
+
+        cache = ParseCache(self.cache_dir)
+        result = cache.parse_files(paths, self.processor, max_workers=3)
+
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual([t.description for t in result['transactions']],
+                         [t.description for t in self.processor.parse_csv_rows(CsvHandler.read_csv_files(paths))['transactions']])
+
+    def _write_input(self, content):
+        """Helper to write the input file."""
+        with open(self.input, 'w') as f:
+            f.write(content)
+
+
+if __name__ == '__main__':
+    unittest.main()
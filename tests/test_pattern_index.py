@@ -0,0 +1,131 @@
+"""
+Unit tests for PatternIndex - testing trigram candidate selection and what-if reports.
+"""
+import unittest
+from receiptsParsing.pattern_index import PatternIndex, required_literals
+from receiptsParsing.transaction import Transaction
+
+
+class TestRequiredLiterals(unittest.TestCase):
+
+    def test_plain_pattern(self):
+        """Test a plain pattern is a single literal."""
+        self.assertEqual(required_literals('WOOLWORTHS'), ['woolworths'])
+
+    def test_metacharacters_split_literals(self):
+        """Test wildcards, classes and escapes split literals."""
+        self.assertEqual(required_literals(r'VISA.*COLES [0-9]+ \d AU'), ['visa', 'coles ', ' ', ' au'])
+
+    def test_optional_characters_and_groups_are_dropped(self):
+        """Test optional characters and groups are not required."""
+        self.assertEqual(required_literals('COLES?X'), ['cole', 'x'])
+        self.assertEqual(required_literals('UBER(EATS)?TRIP'), ['uber', 'trip'])
+
+    def test_escaped_punctuation_is_literal(self):
+        """Test escaped punctuation stays part of the literal."""
+        self.assertEqual(required_literals(r'AMAZON\.COM'), ['amazon.com'])
+
+    def test_alternation_requires_nothing(self):
+        """Test alternation and lookarounds fall back to no requirement."""
+        self.assertEqual(required_literals('COLES|WOOLWORTHS'), [])
+        self.assertEqual(required_literals('(?!COLES)WOOLWORTHS'), [])
+
+    def test_multi_character_escapes_require_nothing(self):
+        """Test escapes spanning several characters do not leak into literals."""
+        for pattern in (r'\x41BC', r'CAF\u00e9', r'\U0001F600 SHOP', r'\N{LATIN SMALL LETTER E}CO',
+                        r'A\012BC', r'(AB)\1CD'):
+            self.assertEqual(required_literals(pattern), [], pattern)
+
+
+class TestPatternIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up an index over a small corpus."""
+        self.purposes_map = {
+            'Groceries': ['WOOLWORTHS'],
+            'Bills': {
+                'Health': ['PHARMACY', 'CHEMIST']
+            }
+        }
+        self.index = PatternIndex(self.purposes_map)
+        self.index.add_transactions([
+            self._create_transaction('WOOLWORTHS METRO'),
+            self._create_transaction('WOOLWORTHS METRO'),
+            self._create_transaction('PHARMACY CHEMIST WAREHOUSE'),
+            self._create_transaction('PRICELINE PHARMACY'),
+            self._create_transaction('METRO PETROL'),
+        ])
+
+    def test_descriptions_are_deduplicated(self):
+        """Test identical descriptions are indexed once."""
+        self.assertEqual(len(self.index.descriptions), 4)
+
+    def test_candidates_use_trigrams(self):
+        """Test only descriptions containing the required trigrams are candidates."""
+        candidates = self.index.candidates('PETROL')
+
+        self.assertEqual([self.index.descriptions[i] for i in candidates],
+                         [self.index.descriptions[3]])
+
+    def test_evaluate_reports_new_and_stolen_matches(self):
+        """Test the report separates new matches from overlaps."""
+        report = self.index.evaluate('metro')
+
+        self.assertEqual(len(report['matches']), 2)
+        self.assertEqual(len(report['new_matches']), 1)
+        self.assertIn('METRO PETROL', report['new_matches'][0])
+        self.assertEqual(list(report['stolen']), [('Groceries',)])
+        self.assertEqual(len(report['new_multiple_matches']), 1)
+
+    def test_evaluate_multiple_match_not_reported_as_new(self):
+        """Test descriptions already matching several categories are not new multiple matches."""
+        report = self.index.evaluate('CHEMIST')
+
+        self.assertEqual(len(report['matches']), 1)
+        self.assertEqual(report['new_multiple_matches'], [])
+        self.assertEqual(list(report['stolen']), [('Bills', 'Health')])
+
+    def test_evaluate_hex_escape_finds_match(self):
+        """Test a hex-escaped pattern still finds its matches."""
+        report = self.index.evaluate(r'\x50ETROL')
+
+        self.assertEqual(len(report['matches']), 1)
+
+    def test_evaluate_without_literals_checks_everything(self):
+        """Test patterns without required literals scan the whole corpus."""
+        report = self.index.evaluate('PRICELINE|PETROL')
+
+        self.assertEqual(report['candidates_checked'], 4)
+        self.assertEqual(len(report['matches']), 2)
+
+    def test_structured_rules_keep_per_transaction_categories(self):
+        """Test one description with amount-dependent categories reports each outcome."""
+        index = PatternIndex({
+            'Bills': {
+                'Rates': [{'description': 'COUNCIL', 'amount': (-1000, -400)}]
+            }
+        })
+        index.add_transactions([
+            self._create_transaction('COUNCIL', '500.00'),
+            self._create_transaction('COUNCIL', '20.00'),
+        ])
+
+        report = index.evaluate('COUNCIL')
+
+        self.assertEqual(len(index.descriptions), 1)
+        self.assertEqual(index.transaction_counts, [2])
+        self.assertEqual(len(report['new_matches']), 1)
+        self.assertEqual(len(report['new_multiple_matches']), 1)
+        self.assertEqual(list(report['stolen']), [('Bills', 'Rates')])
+
+    def _create_transaction(self, description, credit="10.50"):
+        """Helper to create test transaction."""
+        test_row = [
+            "12:34 01-01-25", description, "", credit,
+            "Test Account", "", "Visa", "Shopping", "123", "789"
+        ]
+        return Transaction(test_row)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -148,6 +148,50 @@ class TestTransactionProcessor(unittest.TestCase):
         except Exception as e:
             self.fail(f"CSV parsing should handle errors gracefully, but got: {e}")
 
+    def test_bad_amount_reported_as_parse_error(self):
+        """Test rows with an unparseable amount are reported and skipped."""
+        bad_journal_row = [
+            "12:34 01-01-25", "JOURNAL CREDIT", "abc", "",
+            "Test Account", "", "Internal", "Transfer", "123", "789"
+        ]
+        bad_row = [
+            "12:34 01-01-25", "PHARMACY TEST", "", "",
+            "Test Account", "", "Visa", "Health", "124", "790"
+        ]
+        valid_row = [
+            "12:34 01-01-25", "PHARMACY TEST", "", "10.50",
+            "Test Account", "", "Visa", "Health", "125", "791"
+        ]
+        
+        parse_result = self.processor.parse_csv_rows([bad_journal_row, bad_row, valid_row])
+        process_result = self.processor.process_transactions(parse_result['transactions'])
+        
+        self.assertEqual(len(parse_result['errors']), 1)
+        self.assertIn("Failed to parse row", parse_result['errors'][0])
+        self.assertEqual(len(process_result['errors']), 1)
+        self.assertIn("Failed to parse row", process_result['errors'][0])
+        self.assertEqual(len(process_result['categorized']), 1)
+    
+    def test_filtered_rows_are_not_fully_parsed(self):
+        """Test rows rejected by the date filter never parse their amount."""
+        rows = [
+            ["12:34 01-01-25", "PHARMACY TEST", "", "10.50",
+             "Test Account", "", "Visa", "Health", "124", "790"],
+            ["12:34 01-02-25", "PHARMACY TEST", "", "12.00",
+             "Test Account", "", "Visa", "Health", "125", "791"],
+        ]
+        
+        parse_result = self.processor.parse_csv_rows(rows)
+        process_result = self.processor.process_transactions(
+            parse_result['transactions'],
+            {'start': datetime(2025, 2, 1), 'end': datetime(2025, 2, 28)}
+        )
+        
+        rejected, kept = parse_result['transactions']
+        self.assertEqual(process_result['filtered_out'], 1)
+        self.assertNotIn('amount', vars(rejected))
+        self.assertNotIn('rawFields', vars(rejected))
+        self.assertIn('amount', vars(kept))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
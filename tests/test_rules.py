@@ -0,0 +1,90 @@
+"""
+Unit tests for categorization rules - testing predicates and rule indexing.
+"""
+import random
+import unittest
+from decimal import Decimal
+from receiptsParsing.rules import CategoryRule, IntervalIndex, RuleIndex
+from receiptsParsing.transaction import Transaction
+
+
+class TestIntervalIndex(unittest.TestCase):
+
+    def test_stab_matches_brute_force(self):
+        """Test stabbing queries against a linear scan."""
+        generator = random.Random(42)
+        intervals = []
+        for position in range(200):
+            low = generator.randint(0, 1000)
+            intervals.append((low, low + generator.randint(0, 100), position))
+        index = IntervalIndex(intervals)
+
+        for point in range(-5, 1110, 7):
+            expected = sorted(value for low, high, value in intervals if low <= point <= high)
+            self.assertEqual(sorted(index.stab(point)), expected)
+
+    def test_open_ended_intervals(self):
+        """Test infinite bounds."""
+        index = IntervalIndex([
+            (Decimal('-Infinity'), Decimal('0'), 'negative'),
+            (Decimal('100'), Decimal('Infinity'), 'large'),
+        ])
+
+        self.assertEqual(index.stab(Decimal('-5')), ['negative'])
+        self.assertEqual(index.stab(Decimal('1e9')), ['large'])
+        self.assertEqual(index.stab(Decimal('50')), [])
+
+
+class TestRuleIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up structured and plain rules."""
+        self.rules = [
+            CategoryRule(['Rates'], {'fields': {'Payment type': 'BPAY'}, 'amount': (400, 900)}),
+            CategoryRule(['Savings'], {'source': 'Savings Account'}),
+            CategoryRule(['Large'], {'amount': (1000, None)}),
+            CategoryRule(['Health'], 'PHARMACY'),
+            CategoryRule(['Fuel'], {'merchant': '^PETROL', 'date': ('2025-01-01', None)}),
+        ]
+        self.index = RuleIndex(self.rules)
+
+    def test_equality_and_amount_predicates(self):
+        """Test a bucketed rule still checks its remaining predicates."""
+        self.assertEqual(self.index.match(self._create_transaction('COUNCIL', '500.00', 'bpay')), [['Rates']])
+        self.assertEqual(self.index.match(self._create_transaction('COUNCIL', '950.00', 'BPAY')), [])
+
+    def test_only_relevant_rules_are_candidates(self):
+        """Test rules in non-matching buckets and intervals are not evaluated."""
+        transaction = self._create_transaction('PHARMACY', '10.00', 'Visa')
+
+        candidates = self.index.candidates(transaction)
+
+        self.assertEqual(candidates, [3, 4])
+        self.assertEqual(self.index.match(transaction), [['Health']])
+
+    def test_matches_keep_rule_order(self):
+        """Test multiple matches come out in configuration order."""
+        transaction = self._create_transaction('PHARMACY', '1500.00', 'BPAY', source='Savings Account')
+
+        self.assertEqual(self.index.match(transaction), [['Savings'], ['Large'], ['Health']])
+
+    def test_merchant_and_date_predicates(self):
+        """Test merchant regex uses only the bank description and dates are inclusive."""
+        self.assertEqual(self.index.match(self._create_transaction('PETROL STATION', '50.00', 'Visa')), [['Fuel']])
+        self.assertEqual(self.index.match(self._create_transaction('PETROL STATION', '50.00', 'Visa', date='12:00 31-12-24')), [])
+        self.assertEqual(self.index.match(self._create_transaction('MY PETROL', '50.00', 'Visa')), [])
+
+    def test_unknown_rule_keys_are_rejected(self):
+        """Test typos in rule dicts fail at compile time."""
+        with self.assertRaises(ValueError):
+            CategoryRule(['Bad'], {'ammount': (1, 2)})
+
+    def _create_transaction(self, description, amount, payment_type, source='Test Account', date='12:34 01-01-25'):
+        """Helper to create a ubank debit transaction."""
+        return Transaction([
+            date, description, amount, "", source, "", payment_type, "Bills", "123", "789"
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
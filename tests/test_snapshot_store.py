@@ -0,0 +1,79 @@
+"""
+Unit tests for SnapshotStore - testing deduplication, diff and restore.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+from receiptsParsing.snapshot_store import SnapshotStore
+
+
+class TestSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        """Set up an output directory and an empty store."""
+        self.directory = tempfile.mkdtemp()
+        self.out_dir = os.path.join(self.directory, 'out')
+        os.makedirs(self.out_dir)
+        self.store = SnapshotStore(os.path.join(self.directory, 'bkp'), average_rows=8, max_rows=32)
+        self.rows = [f"2025-01-{day % 28 + 1:02d},{day}.00,Groceries,,,SHOP {day},,Ubank\n" for day in range(500)]
+        self._write('out.csv', ''.join(self.rows))
+        self._write('out.ubank.csv', ''.join(self.rows[:100]))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_unchanged_snapshot_stores_nothing(self):
+        """Test a second snapshot of identical files adds no blocks."""
+        first = self.store.create(self.out_dir)
+        second = self.store.create(self.out_dir)
+
+        self.assertGreater(first['new_blocks'], 0)
+        self.assertEqual(second['new_blocks'], 0)
+        self.assertNotEqual(first['id'], second['id'])
+        self.assertEqual([m['id'] for m in self.store.snapshots()], [first['id'], second['id']])
+
+    def test_inserted_row_only_stores_nearby_blocks(self):
+        """Test content-defined blocks keep later blocks shared after an insert."""
+        first = self.store.create(self.out_dir)
+        self._write('out.csv', ''.join(self.rows[:10] + ["2025-01-01,1.00,TODO,,,NEW,,Ubank\n"] + self.rows[10:]))
+        second = self.store.create(self.out_dir)
+
+        self.assertLessEqual(second['new_blocks'], 2)
+        self.assertGreater(len(first['files']['out.csv']['blocks']), 10)
+
+        result = self.store.diff(first['id'], second['id'])
+        self.assertEqual(list(result['changed']), ['out.csv'])
+        self.assertEqual(result['unchanged'], ['out.ubank.csv'])
+
+    def test_diff_added_and_removed_files(self):
+        """Test files appearing and disappearing between snapshots."""
+        first = self.store.create(self.out_dir)
+        os.unlink(os.path.join(self.out_dir, 'out.ubank.csv'))
+        self._write('out.offset.csv', 'x\n')
+        second = self.store.create(self.out_dir)
+
+        result = self.store.diff(first['id'], second['id'])
+
+        self.assertEqual(result['added'], ['out.offset.csv'])
+        self.assertEqual(result['removed'], ['out.ubank.csv'])
+
+    def test_restore_recreates_files(self):
+        """Test restoring a snapshot gives back identical files."""
+        manifest = self.store.create(self.out_dir)
+        destination = os.path.join(self.directory, 'restored')
+
+        restored = self.store.restore(manifest['id'], destination)
+
+        self.assertEqual(restored, ['out.csv', 'out.ubank.csv'])
+        with open(os.path.join(destination, 'out.csv')) as f:
+            self.assertEqual(f.read(), ''.join(self.rows))
+
+    def _write(self, name, content):
+        """Helper to write a file into the output directory."""
+        with open(os.path.join(self.out_dir, name), 'w') as f:
+            f.write(content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit tests for SqliteStore - testing upserts and indexed queries.
+"""
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from receiptsParsing.sqlite_store import SqliteStore
+
+
+class MockTransaction:
+    def __init__(self, desc, amount, date, source="Test Account"):
+        self.description = desc
+        self.amount = Decimal(str(amount))
+        self.effectiveDate = date
+        self.postedDate = date
+        self.source = source
+
+
+class TestSqliteStore(unittest.TestCase):
+
+    def setUp(self):
+        """Set up an in-memory store with a few transactions."""
+        self.store = SqliteStore(":memory:")
+        self.items = [
+            self._item("PETROL STATION", "45.10", datetime(2024, 3, 1), ['Transport', 'Fuel']),
+            self._item("UBER TRIP", "12.00", datetime(2024, 3, 2), ['Transport', 'Rideshare']),
+            self._item("PETROL STATION", "50.00", datetime(2025, 1, 5), ['Transport', 'Fuel']),
+            self._item("MYSTERY SHOP", "9.99", datetime(2024, 6, 1), None, source="Other Account"),
+        ]
+        self.store.upsert_transactions(self.items, "Ubank")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_query_by_category_and_date(self):
+        """Test category and date range filters combine."""
+        results = self.store.query(category="Transport/Fuel", start="2024-01-01", end="2024-12-31")
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['amount'], Decimal("45.10"))
+        self.assertEqual(results[0]['effective_date'], "2024-03-01")
+
+    def test_query_category_includes_subcategories(self):
+        """Test a parent category matches its children but not lookalike siblings."""
+        results = self.store.query(category="Transport")
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(self.store.query(category="Trans"), [])
+
+    def test_unmatched_stored_as_todo(self):
+        """Test unmatched transactions are stored under TODO."""
+        results = self.store.query(category="TODO")
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['status'], 'no_match')
+
+    def test_query_by_source_and_amount(self):
+        """Test source and amount range filters."""
+        self.assertEqual(len(self.store.query(source="Other Account")), 1)
+        self.assertEqual(len(self.store.query(min_amount=Decimal("12.00"), max_amount=Decimal("46"))), 2)
+
+    def test_query_by_source_label(self):
+        """Test the label a ledger was stored with selects it, even without a source account."""
+        self.store.upsert_transactions([self._item("RATES", "500.00", datetime(2024, 8, 1), ['Bills'], source="")],
+                                       "Loans")
+
+        results = self.store.query(source_label="Loans")
+
+        self.assertEqual([result['description'] for result in results], ["RATES"])
+        self.assertEqual(len(self.store.query(source_label="Ubank")), 4)
+
+    def test_upsert_updates_categorization(self):
+        """Test re-upserting a transaction updates it instead of duplicating it."""
+        recategorized = self._item("MYSTERY SHOP", "9.99", datetime(2024, 6, 1),
+                                   ['Discretionary', 'Shopping'], source="Other Account")
+        self.store.upsert_transactions([recategorized], "Ubank")
+
+        self.assertEqual(len(self.store.query()), 4)
+        self.assertEqual(self.store.query(source="Other Account")[0]['category'], "Discretionary/Shopping")
+
+    def test_identical_rows_are_kept(self):
+        """Test identical rows within one batch are stored separately."""
+        duplicate = self._item("COFFEE", "4.50", datetime(2024, 7, 1), ['Discretionary'])
+        self.store.upsert_transactions([duplicate, duplicate], "Ubank")
+
+        self.assertEqual(len(self.store.query(category="Discretionary")), 2)
+
+    def _item(self, desc, amount, date, category, source="Test Account"):
+        """Helper to create a processor result item."""
+        return {
+            'transaction': MockTransaction(desc, amount, date, source),
+            'categorization': {
+                'status': 'matched' if category else 'no_match',
+                'selected_category': category
+            }
+        }
+
+
+if __name__ == '__main__':
+    unittest.main()
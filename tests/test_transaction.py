@@ -0,0 +1,80 @@
+"""
+Unit tests for Transaction - testing lazy field materialisation for each row format.
+"""
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from receiptsParsing.transaction import Transaction
+
+
+class TestTransaction(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a ubank activity row."""
+        self.ubank_row = [
+            "12:34 15-06-25", "PHARMACY GUILD", "", "$1,010.50",
+            "", "Test Account", "Visa", "Health", "", "789"
+        ]
+
+    def test_ubank_fields(self):
+        """Test the ubank activity format builds the same values as before."""
+        transaction = Transaction(self.ubank_row)
+
+        self.assertEqual(transaction.description,
+                         "PHARMACY GUILD; To account: Test Account; Payment type: Visa; "
+                         "Category: Health; Transaction ID: 789")
+        self.assertEqual(transaction.amount, Decimal("-1010.50"))
+        self.assertEqual(transaction.source, "Test Account")
+        self.assertEqual(transaction.postedDate, datetime(2025, 6, 15, 12, 34))
+        self.assertEqual(transaction.effectiveDate, transaction.postedDate)
+
+    def test_fields_are_computed_lazily(self):
+        """Test nothing beyond the raw row is built until it is accessed."""
+        transaction = Transaction(self.ubank_row)
+
+        self.assertEqual(transaction.rawDescription, "PHARMACY GUILD")
+        self.assertNotIn('description', vars(transaction))
+        self.assertNotIn('amount', vars(transaction))
+
+        transaction.amount
+        self.assertIn('amount', vars(transaction))
+
+    def test_raw_fields_by_name(self):
+        """Test raw fields are available individually."""
+        transaction = Transaction(self.ubank_row)
+
+        self.assertEqual(transaction.rawFields["Payment type"], "Visa")
+        self.assertEqual(transaction.rawFields["Description"], "PHARMACY GUILD")
+
+    def test_description_can_be_overridden(self):
+        """Test assigning a description replaces the computed one."""
+        transaction = Transaction(self.ubank_row)
+        transaction.description = "JOURNAL CREDIT; " + transaction.description
+
+        self.assertTrue(transaction.description.startswith("JOURNAL CREDIT; PHARMACY GUILD"))
+
+    def test_loans_format(self):
+        """Test the loans.com.au format keeps separate posted and effective dates."""
+        transaction = Transaction(["02/01/2025", "01/01/2025", "REPAYMENT", "100.00", "", "5000.00"])
+
+        self.assertEqual(transaction.postedDate, datetime(2025, 1, 2))
+        self.assertEqual(transaction.effectiveDate, datetime(2025, 1, 1))
+        self.assertEqual(transaction.amount, Decimal("-100.00"))
+        self.assertEqual(transaction.source, "")
+
+    def test_ubank_old_format(self):
+        """Test the old ubank format."""
+        transaction = Transaction(["", "03/01/2025", "INTEREST", "-12.34", "100.00"])
+
+        self.assertEqual(transaction.postedDate, datetime(2025, 1, 3))
+        self.assertEqual(transaction.description, "INTEREST")
+        self.assertEqual(transaction.amount, Decimal("12.34"))
+
+    def test_unsupported_row_length(self):
+        """Test rows of unsupported length are rejected up front."""
+        with self.assertRaises(ValueError):
+            Transaction(["too", "few"])
+
+
+if __name__ == '__main__':
+    unittest.main()
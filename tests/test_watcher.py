@@ -0,0 +1,79 @@
+"""
+Unit tests for InputWatcher - testing change detection and batching.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+from receiptsParsing.watcher import InputWatcher
+
+
+class TestInputWatcher(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary input directory with an existing export."""
+        self.directory = tempfile.mkdtemp()
+        self._write('old.csv', 'a,b\n')
+        self.batches = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_existing_files_are_ignored_by_default(self):
+        """Test files present at start are not treated as new."""
+        watcher = self._create_watcher()
+
+        self.assertEqual(watcher.poll_once(0), [])
+        self.assertEqual(self.batches, [])
+
+    def test_existing_files_processed_when_requested(self):
+        """Test process_existing hands over files present at start."""
+        watcher = self._create_watcher(process_existing=True)
+
+        watcher.poll_once(0)
+
+        self.assertEqual(self.batches, [[os.path.join(self.directory, 'old.csv')]])
+
+    def test_new_files_are_batched(self):
+        """Test several new files arrive in one sorted batch."""
+        watcher = self._create_watcher()
+        self._write('b.csv', 'x\n')
+        self._write('a.csv', 'y\n')
+        self._write('notes.txt', 'ignored\n')
+
+        watcher.poll_once(0)
+
+        self.assertEqual(self.batches, [[os.path.join(self.directory, 'a.csv'),
+                                         os.path.join(self.directory, 'b.csv')]])
+
+    def test_batch_waits_for_debounce(self):
+        """Test a batch is held back until changes settle."""
+        watcher = self._create_watcher(debounce=60)
+        self._write('new.csv', 'x\n')
+
+        self.assertEqual(watcher.poll_once(0), [])
+        self.assertEqual(watcher.pending, {os.path.join(self.directory, 'new.csv')})
+
+    def test_changed_file_is_reported_again(self):
+        """Test a file that grows after being handed over is picked up again."""
+        watcher = self._create_watcher()
+        self._write('new.csv', 'x\n')
+        watcher.poll_once(0)
+        self._write('new.csv', 'x\ny\n')
+        watcher.poll_once(0)
+
+        self.assertEqual(len(self.batches), 2)
+
+    def _create_watcher(self, debounce=0, process_existing=False):
+        """Helper to create a polling watcher recording its batches."""
+        return InputWatcher(self.directory, self.batches.append, debounce=debounce,
+                            process_existing=process_existing, use_inotify=False)
+
+    def _write(self, name, content):
+        """Helper to write a file into the input directory."""
+        with open(os.path.join(self.directory, name), 'w') as f:
+            f.write(content)
+
+
+if __name__ == '__main__':
+    unittest.main()
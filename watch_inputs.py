@@ -0,0 +1,94 @@
+#!/usr/bin/python
+import sys
+import argparse
+from receiptsParsing.processor import TransactionProcessor
+from receiptsParsing.csv_handler import CsvHandler
+from receiptsParsing.watcher import InputWatcher
+
+
+def make_batch_handler(processor, out_file_name, source):
+    """Return a callback that categorizes a batch of files and merges them into the output."""
+
+    def handle_batch(file_paths):
+        print(f"Processing: {', '.join(file_paths)}")
+
+        try:
+            csv_rows = CsvHandler.read_csv_files(file_paths)
+        except Exception as e:
+            print(f"Error reading CSV files: {e}")
+            return
+
+        parse_result = processor.parse_csv_rows(csv_rows)
+        for error in parse_result['errors']:
+            print(error)
+
+        process_result = processor.process_transactions(parse_result['transactions'])
+        for error in process_result['errors']:
+            print(error)
+
+        all_for_csv = []
+        all_for_csv.extend(process_result['categorized'])
+        all_for_csv.extend(process_result['multiple_matches'])
+        all_for_csv.extend(process_result['unmatched'])
+
+        try:
+            added = CsvHandler.merge_transactions(out_file_name, all_for_csv, source)
+        except Exception as e:
+            print(f"Error writing output file: {e}")
+            return
+
+        for item in process_result['multiple_matches']:
+            transaction = item['transaction']
+            print(f"Multiple matches for: {transaction.description} ({transaction.amount})")
+
+        for item in process_result['unmatched']:
+            transaction = item['transaction']
+            print(f"No match: {transaction.description} ({transaction.amount})")
+
+        print(f"Added {added} transactions to {out_file_name}")
+
+    return handle_batch
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Categorize new exports as they land in the input directory.")
+    parser.add_argument('--inDir', dest='inDir', default="in")
+    parser.add_argument('--outFileName', dest='outFileName', default="out/out.csv")
+    parser.add_argument('--source', dest='source', default="Ubank")
+    parser.add_argument('--debounce', dest='debounce', type=float, default=2.0)
+    parser.add_argument('--pollInterval', dest='pollInterval', type=float, default=1.0)
+    parser.add_argument('--processExisting', action='store_true')
+    parser.add_argument('--poll', action='store_true', help="Poll even if inotify is available")
+    args = parser.parse_args()
+
+    # Load purposes configuration from external file
+    try:
+        from purposes_config import purposesMap
+    except ImportError:
+        print("Error: purposes_config.py not found. Please create it from purposes_config.example.py")
+        sys.exit(1)
+
+    # Compile the patterns once and keep the processor warm between batches
+    processor = TransactionProcessor(purposesMap)
+
+    watcher = InputWatcher(
+        args.inDir,
+        make_batch_handler(processor, args.outFileName, args.source),
+        debounce=args.debounce,
+        poll_interval=args.pollInterval,
+        process_existing=args.processExisting,
+        use_inotify=not args.poll
+    )
+    print(f"Watching {args.inDir} ({'inotify' if watcher.using_inotify else 'polling'})")
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    main()
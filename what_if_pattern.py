@@ -0,0 +1,83 @@
+#!/usr/bin/python
+import sys
+import time
+import argparse
+from receiptsParsing.processor import TransactionProcessor
+from receiptsParsing.csv_handler import CsvHandler
+from receiptsParsing.pattern_index import PatternIndex
+
+
+def print_report(pattern, report, elapsed):
+    """Print the effect a candidate pattern would have on the corpus."""
+    print(f"Pattern: {pattern} ({len(report['matches'])} matches, "
+          f"{report['candidates_checked']} checked, {elapsed * 1000:.1f} ms)")
+
+    for description in report['new_matches']:
+        print(f"  New match: {description}")
+
+    for path, descriptions in report['stolen'].items():
+        print(f"  Overlaps {'/'.join(path)}: {len(descriptions)}")
+        for description in descriptions:
+            print(f"    {description}")
+
+    for description in report['new_multiple_matches']:
+        print(f"  New multiple match: {description}")
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description="Show which historical descriptions a candidate purposesMap pattern would match."
+    )
+    parser.add_argument('inFiles', metavar='inFile', nargs='+')
+    parser.add_argument('--pattern', dest='patterns', action='append', default=[],
+                        help="Pattern to evaluate; may be repeated. Reads patterns from stdin if omitted.")
+    args = parser.parse_args()
+
+    # Load purposes configuration from external file
+    try:
+        from purposes_config import purposesMap
+    except ImportError:
+        print("Error: purposes_config.py not found. Please create it from purposes_config.example.py")
+        sys.exit(1)
+
+    # Read CSV files
+    try:
+        csv_rows = CsvHandler.read_csv_files(args.inFiles)
+    except Exception as e:
+        print(f"Error reading CSV files: {e}")
+        sys.exit(1)
+
+    # Build the deduplicated corpus once
+    processor = TransactionProcessor(purposesMap)
+    parse_result = processor.parse_csv_rows(csv_rows)
+    transactions, errors = processor.validate_transactions(parse_result['transactions'])
+    for error in parse_result['errors'] + errors:
+        print(error)
+    index = PatternIndex(purposesMap)
+    index.add_transactions(transactions)
+    print(f"Indexed {len(index.descriptions)} distinct descriptions")
+
+    patterns = args.patterns
+    interactive = not patterns
+    if interactive:
+        patterns = iter(lambda: input("pattern> "), None)
+
+    try:
+        for pattern in patterns:
+            if not pattern:
+                continue
+            start = time.perf_counter()
+            try:
+                report = index.evaluate(pattern)
+            except Exception as e:
+                print(f"Invalid pattern: {pattern} - {e}")
+                continue
+            print_report(pattern, report, time.perf_counter() - start)
+    except (EOFError, KeyboardInterrupt):
+        if interactive:
+            print()
+
+
+if __name__ == "__main__":
+    main()